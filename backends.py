@@ -0,0 +1,246 @@
+# backends.py
+# Data sources behind the six dashboard datasets.
+# SyntheticSource serves the fake data from generators.py; ArrowSource reads
+# real extracts stored as (optionally hive-partitioned) Parquet or Arrow IPC
+# files, pushing column projection and row filters down to the scan and
+# memory-mapping the files so only the requested columns and rows are read.
+import operator
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import fs
+
+from generators import DEFAULT_SEED, DEFAULT_SIZES, GENERATORS
+from schema import compact
+
+TABLES = list(GENERATORS)
+
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+AGGREGATES_DIR = "_aggregates"
+
+# Columns used to partition each table when exporting extracts
+PARTITIONS = {
+    "policies": ["Product"],
+    "claims": ["Status"],
+    "underwriting": ["Status"],
+    "marketing": ["Stage"],
+    "sales": ["Region"],
+    "eapps": ["Status"],
+}
+
+_OPERATORS = {
+    "==": operator.eq,
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+# Filters use the pyarrow/pandas DNF convention: a list of
+# (column, op, value) tuples ANDed together, or a list of such lists ORed.
+def _conjunctions(filters):
+    if filters and isinstance(filters[0], tuple):
+        return [filters]
+    return filters
+
+
+def filters_key(filters):
+    if not filters:
+        return None
+    return tuple(
+        tuple(
+            (col, op, tuple(val) if isinstance(val, (list, set)) else val)
+            for col, op, val in conj
+        )
+        for conj in _conjunctions(filters)
+    )
+
+
+def apply_filters(df, filters):
+    if not filters:
+        return df
+    keep = None
+    for conj in _conjunctions(filters):
+        mask = pd.Series(True, index=df.index)
+        for col, op, val in conj:
+            if op == "in":
+                mask &= df[col].isin(val)
+            elif op == "not in":
+                mask &= ~df[col].isin(val)
+            else:
+                mask &= _OPERATORS[op](df[col], val)
+        keep = mask if keep is None else keep | mask
+    return df[keep]
+
+
+class DataSource:
+    # Sources that can apply projection/filters themselves set pushdown;
+    # otherwise the dataset layer loads the full table once and slices it.
+    # Out-of-core sources are too large to load whole; their aggregates are
+    # built by streaming chunks (see chunked.py).
+    pushdown = False
+    out_of_core = False
+
+    def key(self):
+        raise NotImplementedError
+
+    def load(self, table, columns=None, filters=None):
+        raise NotImplementedError
+
+    # Forget anything read from the underlying files
+    def refresh(self, table=None):
+        pass
+
+    # Precomputed aggregate published alongside the tables, if any
+    def load_aggregate(self, name):
+        return None
+
+    def count_rows(self, table):
+        return len(self.load(table))
+
+
+class SyntheticSource(DataSource):
+    def __init__(self, sizes=None, seed=DEFAULT_SEED):
+        self.sizes = {**DEFAULT_SIZES, **(sizes or {})}
+        self.seed = seed
+
+    def key(self):
+        return ("synthetic", tuple(sorted(self.sizes.items())), self.seed)
+
+    def load(self, table, columns=None, filters=None):
+        kwargs = {"num": self.sizes[table], "seed": self.seed}
+        if table == "claims":
+            kwargs["num_policies"] = self.sizes["policies"]
+        df = apply_filters(GENERATORS[table](**kwargs), filters)
+        return df[columns] if columns else df
+
+
+class ArrowSource(DataSource):
+    # Each table is either a directory (<root>/<table>/, hive-partitioned or
+    # not) or a single file (<root>/<table>.parquet / .arrow).
+    pushdown = True
+
+    def __init__(self, root, format="parquet", memory_map=True, out_of_core=False):
+        if format not in FORMATS:
+            raise ValueError(f"Unsupported format {format!r}; expected one of {list(FORMATS)}")
+        self.root = os.path.abspath(root)
+        self.format = format
+        self.memory_map = memory_map
+        self.out_of_core = out_of_core
+        self._filesystem = fs.LocalFileSystem(use_mmap=memory_map)
+        self._datasets = {}
+
+    def key(self):
+        return (self.format, self.root)
+
+    def path(self, table):
+        path = os.path.join(self.root, table)
+        if os.path.isdir(path):
+            return path
+        return path + FORMATS[self.format]
+
+    def refresh(self, table=None):
+        if table is None:
+            self._datasets.clear()
+        else:
+            self._datasets.pop(table, None)
+
+    def dataset(self, table):
+        if table not in self._datasets:
+            self._datasets[table] = ds.dataset(
+                self.path(table),
+                format="ipc" if self.format == "arrow" else "parquet",
+                partitioning="hive",
+                filesystem=self._filesystem,
+            )
+        return self._datasets[table]
+
+    def scanner(self, table, columns=None, filters=None, batch_size=None):
+        kwargs = {"columns": columns, "filter": to_expression(filters)}
+        if batch_size:
+            kwargs["batch_size"] = batch_size
+        return self.dataset(table).scanner(**kwargs)
+
+    def load(self, table, columns=None, filters=None):
+        path = self.path(table)
+        if self.format == "arrow" and self.memory_map and os.path.isfile(path):
+            return _read_ipc(path, columns, filters)
+        return self.scanner(table, columns, filters).to_table().to_pandas(split_blocks=True)
+
+    # From the files' metadata where the format has it, without reading rows
+    def count_rows(self, table):
+        return self.dataset(table).count_rows()
+
+    def load_aggregate(self, name):
+        path = os.path.join(self.root, AGGREGATES_DIR, name + FORMATS["arrow"])
+        return _read_ipc(path) if os.path.isfile(path) else None
+
+
+# A single-batch IPC file read through a memory map comes back as unchunked
+# views of the mapped pages, which to_pandas can wrap without copying (only
+# categorical codes are rebuilt). Processes mapping the same file share it.
+def _read_ipc(path, columns=None, filters=None):
+    table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+    if columns:
+        table = table.select(columns)
+    if filters:
+        table = table.filter(to_expression(filters))
+    return table.to_pandas(split_blocks=True)
+
+
+def to_expression(filters):
+    if not filters:
+        return None
+    return pq.filters_to_expression(
+        [[(c, "==" if op == "=" else op, v) for c, op, v in conj] for conj in _conjunctions(filters)]
+    )
+
+
+# Write a table in the layout ArrowSource reads
+def write_table(df, root, table, format="parquet", partition_cols=None):
+    ds.write_dataset(
+        pa.Table.from_pandas(df, preserve_index=False),
+        os.path.join(root, table),
+        format="ipc" if format == "arrow" else "parquet",
+        partitioning=partition_cols,
+        partitioning_flavor="hive" if partition_cols else None,
+        existing_data_behavior="delete_matching",
+    )
+
+
+# Write df as one Arrow IPC file with a single record batch, the layout
+# _read_ipc maps without copying. The file is replaced atomically, so
+# processes still mapping the old version keep reading it consistently.
+def write_ipc(df, path):
+    table = pa.Table.from_pandas(df, preserve_index=False).combine_chunks()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, path)
+
+
+# Dump a synthetic book to disk, e.g. to try the file-backed source
+def export_synthetic(root, format="parquet", sizes=None, seed=DEFAULT_SEED):
+    source = SyntheticSource(sizes, seed)
+    for table in TABLES:
+        write_table(compact(table, source.load(table)), root, table, format, PARTITIONS[table])
+
+
+# The dashboard reads real extracts when INSUREAI_DATA_DIR is set, and
+# summarizes them chunk by chunk when INSUREAI_OUT_OF_CORE=1
+def default_source():
+    root = os.environ.get("INSUREAI_DATA_DIR")
+    if root:
+        return ArrowSource(
+            root,
+            os.environ.get("INSUREAI_DATA_FORMAT", "parquet"),
+            out_of_core=os.environ.get("INSUREAI_OUT_OF_CORE") == "1",
+        )
+    return SyntheticSource()
@@ -0,0 +1,119 @@
+# batch_scoring.py
+# Headless nightly scoring of the open claims queue and underwriting backlog.
+# Runs the vectorized claim-assessment and underwriting logic from
+# inference.py over whole tables in chunks spread across a process pool,
+# writes the results back as columns and reports throughput.
+#
+#   python batch_scoring.py --workers 8 --output scored/
+#   python batch_scoring.py --claims-rows 5000000 --cases-rows 1000000
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from backends import FORMATS, SyntheticSource
+from datasets import get_dataset, row_chunks
+from inference import score_cases, score_claims
+from schema import display
+
+OPEN_CLAIM_STATUSES = ["Submitted", "In Review"]
+OPEN_CASE_STATUSES = ["New", "In Review"]
+
+# Writers for the binary formats; both take a stream of tables
+WRITERS = {"parquet": pq.ParquetWriter, "arrow": pa.ipc.new_file}
+
+JOBS = {
+    "claims": (score_claims, OPEN_CLAIM_STATUSES),
+    "underwriting": (score_cases, OPEN_CASE_STATUSES),
+}
+
+
+# Score df chunk by chunk (on executor's workers when given) and append the
+# score columns
+def score_frame(df, scorer, chunk_size=250_000, executor=None):
+    mapper = executor.map if executor is not None else map
+    scores = list(mapper(scorer, row_chunks(df, chunk_size))) or [scorer(df)]
+    return df.join(pd.concat(scores))
+
+
+# Write a scored table to one file with its IDs formatted ("CLM20001"), a
+# chunk at a time, so only one formatted chunk is ever in memory
+def write_scored(scored, output, table, format="parquet", chunk_size=250_000):
+    chunks = (display(chunk) for chunk in list(row_chunks(scored, chunk_size)) or [scored])
+    os.makedirs(output, exist_ok=True)
+    if format == "csv":
+        path = os.path.join(output, f"{table}_scored.csv")
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(path, index=False, mode="a" if i else "w", header=not i)
+        return
+    path = os.path.join(output, f"{table}_scored{FORMATS[format]}")
+    writer = schema = None
+    try:
+        for chunk in chunks:
+            # Every chunk takes the first one's schema, as the writer expects
+            batch = pa.Table.from_pandas(chunk, preserve_index=False, schema=schema)
+            if writer is None:
+                schema = batch.schema
+                writer = WRITERS[format](path, schema)
+            writer.write_table(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def run(tables=tuple(JOBS), source=None, workers=None, chunk_size=250_000, output=None, format="parquet"):
+    report = []
+    pool = ProcessPoolExecutor(workers) if workers != 1 else None
+    try:
+        for table in tables:
+            scorer, open_statuses = JOBS[table]
+            load_start = time.perf_counter()
+            queue = get_dataset(table, filters=[("Status", "in", open_statuses)], source=source)
+            score_start = time.perf_counter()
+            scored = score_frame(queue, scorer, chunk_size, executor=pool)
+            elapsed = time.perf_counter() - score_start
+            if output:
+                write_scored(scored, output, table, format, chunk_size)
+            report.append({
+                "table": table,
+                "rows": len(scored),
+                "load_seconds": round(score_start - load_start, 3),
+                "score_seconds": round(elapsed, 3),
+                "rows_per_second": round(len(scored) / elapsed) if elapsed else None,
+            })
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch-score open claims and underwriting cases.")
+    parser.add_argument("--tables", nargs="+", choices=list(JOBS), default=list(JOBS))
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=250_000)
+    parser.add_argument("--output", help="directory to write the scored tables to")
+    parser.add_argument("--format", choices=["parquet", "arrow", "csv"], default="parquet")
+    parser.add_argument("--claims-rows", type=int, help="score a synthetic book of this many claims")
+    parser.add_argument("--cases-rows", type=int, help="score a synthetic book of this many cases")
+    args = parser.parse_args(argv)
+
+    source = None
+    if args.claims_rows or args.cases_rows:
+        sizes = {}
+        if args.claims_rows:
+            sizes["claims"] = args.claims_rows
+        if args.cases_rows:
+            sizes["underwriting"] = args.cases_rows
+        source = SyntheticSource(sizes)
+
+    report = run(args.tables, source, args.workers, args.chunk_size, args.output, args.format)
+    print(pd.DataFrame(report).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+# benchmarks.py
+# Headless benchmark suite for the dashboard.
+# Times every generate_* function, the aggregations behind the pages and a
+# cold and warm render of each sidebar page (through streamlit's AppTest)
+# at several table sizes, records peak traced memory for each, and writes
+# the results as JSON. --compare checks a run against a saved baseline and
+# exits non-zero when anything got slower than the threshold allows.
+#
+#   python benchmarks.py --sizes 1000 100000 --output bench.json
+#   python benchmarks.py --output new.json --compare bench.json --threshold 0.25
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import streamlit
+
+import datasets
+from backends import SyntheticSource
+from chunked import reduce, summary_jobs
+from entity_index import EntityIndex
+from fraud_rules import evaluate
+from generators import DEFAULT_SEED, GENERATORS
+from inference import score_cases, score_claims
+from kpis import CUBES, KpiEngine, aggregate, cube_columns
+from relations import Relations
+from schema import compact
+from similarity import CaseIndex, historical_cases
+from tables import TableIndex
+from timeseries import daily_rollup
+
+SIZES = [1_000, 100_000, 10_000_000]
+GROUPS = ["generate", "aggregate", "render"]
+DASHBOARD = os.path.join(os.path.dirname(os.path.abspath(__file__)), "insurance_ai_dashboard.py")
+
+
+# Wall time of fn(); with memory=True, a second run under tracemalloc gives
+# the peak of Python/NumPy allocations (Arrow's own pool is not traced)
+def _measure(fn, memory=True):
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            fn()
+            peak = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+    return seconds, peak
+
+
+def _result(group, name, rows, seconds, peak):
+    return {
+        "group": group,
+        "name": name,
+        "rows": rows,
+        "seconds": round(seconds, 4),
+        "peak_mb": None if peak is None else round(peak, 1),
+    }
+
+
+def bench_generators(rows, memory=True):
+    results = []
+    for name, generate in GENERATORS.items():
+        kwargs = {"num": rows, "seed": DEFAULT_SEED}
+        if name == "claims":
+            kwargs["num_policies"] = rows
+        results.append(_result("generate", name, rows, *_measure(lambda: generate(**kwargs), memory)))
+    return results
+
+
+# The groupbys, rules and indexes the pages build, called directly on the
+# compacted tables
+def bench_aggregations(rows, memory=True):
+    source = SyntheticSource({table: rows for table in GENERATORS})
+    book = {table: compact(table, source.load(table)) for table in GENERATORS}
+    claims, sales, eapps = book["claims"], book["sales"], book["eapps"]
+    raw_claims = source.load("claims")
+    relations = Relations(book["policies"], sales)
+    relations.add_claims(claims)
+    history = historical_cases(book["underwriting"])
+    case_index = CaseIndex(history)
+    probe_case = book["underwriting"].iloc[[0]]
+
+    # Cubes from the loaded book, so every pass aggregates the same rows
+    # rather than reading the dataset cache
+    def cube(table):
+        return aggregate(table, book[table][cube_columns(table)])
+
+    cases = {
+        "compact_claims": lambda: compact("claims", raw_claims),
+        "kpi_engine_build": lambda: [KpiEngine(cube).cube(table) for table in CUBES],
+        "chunked_summary": lambda: reduce(source, summary_jobs(), workers=1, chunk_rows=max(rows // 8, 1)),
+        "fraud_rules": lambda: evaluate(claims, book["policies"]),
+        "claims_daily_rollup": lambda: daily_rollup(claims, "Date Filed", ["Amount"], by="AI Flag"),
+        "sales_by_product": lambda: sales.groupby("Product", observed=True)["Premium"].sum(),
+        "sales_by_agent": lambda: sales.groupby("Agent", observed=True)["Premium"].sum(),
+        "eapp_completion_by_product": lambda: eapps.groupby("Product", observed=True)["Completion %"].mean(),
+        "claims_queue_sort": lambda: TableIndex(claims).page("Amount", False, {"Status": ["Submitted"]}),
+        "relations_join": lambda: Relations(book["policies"], sales).add_claims(claims),
+        "loss_ratio_by_region": lambda: relations._loss_ratio("Region"),
+        "claims_entity_index": lambda: EntityIndex(claims, "Claim ID").search("CLM2"),
+        "score_claims": lambda: score_claims(claims),
+        "score_cases": lambda: score_cases(book["underwriting"]),
+        "case_index_build": lambda: CaseIndex(history),
+        "similar_cases": lambda: case_index.similar(probe_case, k=5),
+    }
+    datasets.set_source(source)
+    try:
+        return [_result("aggregate", name, rows, *_measure(fn, memory)) for name, fn in cases.items()]
+    finally:
+        datasets.set_source(None)
+
+
+# Cold (empty caches) and warm render of each sidebar page
+def bench_pages(rows, memory=True, pages=None):
+    import views
+    from streamlit.testing.v1 import AppTest
+
+    def render(page):
+        app = AppTest.from_file(DASHBOARD, default_timeout=3600)
+        app.session_state["page"] = page
+        app.run()
+        if app.exception:
+            raise RuntimeError(f"{page} raised: {app.exception[0].message}")
+
+    results = []
+    datasets.set_source(SyntheticSource({table: rows for table in GENERATORS}))
+    try:
+        for page in pages or views.PAGES:
+            def cold():
+                datasets.invalidate()
+                render(page)
+
+            results.append(_result("render", f"{page} (cold)", rows, *_measure(cold, memory)))
+            results.append(_result("render", f"{page} (warm)", rows, *_measure(lambda: render(page), memory)))
+    finally:
+        datasets.set_source(None)
+    return results
+
+
+def run(sizes=SIZES, groups=GROUPS, memory=True):
+    benches = {"generate": bench_generators, "aggregate": bench_aggregations, "render": bench_pages}
+    results = []
+    for rows in sizes:
+        for group in groups:
+            for result in benches[group](rows, memory):
+                print(f"{result['group']:9} {result['name']:40} {rows:>10,} rows "
+                      f"{result['seconds']:9.3f}s  peak {result['peak_mb'] or 0:8.1f} MB", flush=True)
+                results.append(result)
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "pyarrow": pa.__version__,
+            "streamlit": streamlit.__version__,
+        },
+        "results": results,
+    }
+
+
+# Benchmarks that got slower than baseline by more than `threshold`
+# (a fraction). Timings under min_seconds are too noisy to judge.
+def compare(baseline, current, threshold=0.2, min_seconds=0.05):
+    before = {(r["group"], r["name"], r["rows"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = before.get((result["group"], result["name"], result["rows"]))
+        if old is None or max(old["seconds"], result["seconds"]) < min_seconds:
+            continue
+        change = result["seconds"] / old["seconds"] - 1 if old["seconds"] else float("inf")
+        if change > threshold:
+            regressions.append({**result, "baseline_seconds": old["seconds"], "change": round(change, 3)})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark generators, aggregations and page renders.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="rows per table")
+    parser.add_argument("--groups", nargs="+", choices=GROUPS, default=GROUPS)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, e.g. 0.2 for 20%%")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.groups, memory=not args.no_memory)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['group']} {r['name']} @ {r['rows']:,} rows: "
+                  f"{r['baseline_seconds']:.3f}s -> {r['seconds']:.3f}s ({r['change']:+.0%})")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+# charts.py
+# Memoized Plotly figures.
+# Pages build each chart from a small pre-aggregated frame (one row per
+# category or plotted point, never one per table row) and go through
+# figure(), which keeps the finished figure in the dataset cache under the
+# chart's name, the version of the data it was drawn from and the UI state
+# that shapes it (granularity, breakdown, filters). Reruns with unchanged
+# inputs skip Plotly Express altogether, and the payload Streamlit
+# serializes stays bounded by the number of categories.
+from datasets import cached, get_source
+
+
+# Size of a figure's JSON, about what it holds in memory
+def _figure_size(fig):
+    return len(fig.to_json())
+
+
+# Cached figures are shared between sessions and must not be modified
+def figure(name, build, version=0, state=None, deps=()):
+    key = ("figure", get_source().key(), name, version, state)
+    return cached(key, build, deps=deps, size=_figure_size)
+
+
+# Sum of `value` per combination of the categorical `by` columns, the
+# frame a bar or pie chart needs in place of the raw rows
+def totals(df, by, value):
+    return df.groupby(by, observed=True, sort=True)[value].sum().reset_index()
+
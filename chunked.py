@@ -0,0 +1,210 @@
+# chunked.py
+# Out-of-core aggregation for archives larger than memory.
+# A table is read as a stream of chunks (Parquet row groups or Arrow record
+# batches, only the columns a job needs), each chunk is reduced to a small
+# partial aggregate (KPI cube cells, daily rollup rows) and partials are
+# merged as they come in, so memory holds one chunk per worker plus the
+# partials. Files and row groups are spread over a process pool.
+# summarize() writes the merged KPI cubes and daily rollups next to the
+# data (<root>/_aggregates/), where the dashboard loads them instead of
+# the tables.
+#
+#   python chunked.py /data/archive --format parquet --workers 16
+import argparse
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from backends import AGGREGATES_DIR, FORMATS, ArrowSource, write_ipc
+from datasets import row_chunks
+from kpis import CUBES, aggregate, cube_columns, merge_cubes
+from schema import compact
+from timeseries import SERIES, daily_rollup, merge_daily, published_name
+
+CHUNK_ROWS = 1_000_000
+
+# A mergeable aggregate over one table: reduce(chunk) gives a partial,
+# merge(a, b) combines two partials
+Job = namedtuple("Job", ["table", "columns", "reduce", "merge"])
+
+# Categorical split of each daily rollup that summarize() publishes
+DAILY_SPLITS = {"claims": "AI Flag", "sales": None}
+
+
+def _daily(table, by, chunk):
+    spec = SERIES[table]
+    return daily_rollup(chunk, spec["date"], spec["sums"], by)
+
+
+def kpi_job(table):
+    return Job(table, cube_columns(table), partial(aggregate, table), merge_cubes)
+
+
+def daily_job(table, by=None):
+    spec = SERIES[table]
+    columns = [spec["date"], *spec["sums"]] + ([by] if by else [])
+    return Job(table, columns, partial(_daily, table, by), merge_daily)
+
+
+# Everything the overview, sales and eApplication charts aggregate
+def summary_jobs():
+    jobs = {f"kpi_{table}": kpi_job(table) for table in CUBES}
+    jobs.update({published_name(table, by): daily_job(table, by) for table, by in DAILY_SPLITS.items()})
+    return jobs
+
+
+# Units of parallel work for a table, as (path, partition values, row
+# groups): runs of Parquet row groups of about chunk_rows rows, or whole
+# Arrow IPC files
+def _pieces(source, table, chunk_rows=CHUNK_ROWS):
+    pieces = []
+    for fragment in source.dataset(table).get_fragments():
+        keys = ds.get_partition_keys(fragment.partition_expression)
+        if source.format != "parquet":
+            pieces.append((fragment.path, keys, None))
+            continue
+        metadata = pq.ParquetFile(fragment.path).metadata
+        run, rows = [], 0
+        for i in range(metadata.num_row_groups):
+            run.append(i)
+            rows += metadata.row_group(i).num_rows
+            if rows >= chunk_rows:
+                pieces.append((fragment.path, keys, run))
+                run, rows = [], 0
+        if run:
+            pieces.append((fragment.path, keys, run))
+    return pieces
+
+
+# Combine small record batches (e.g. one per small row group) into tables
+# of about chunk_rows rows
+def _rebatch(batches, chunk_rows):
+    pending, rows = [], 0
+    for batch in batches:
+        pending.append(batch)
+        rows += batch.num_rows
+        if rows >= chunk_rows:
+            yield pa.Table.from_batches(pending)
+            pending, rows = [], 0
+    if pending:
+        yield pa.Table.from_batches(pending)
+
+
+def _read_piece(format, table, piece, columns, chunk_rows):
+    path, keys, row_groups = piece
+    stored = [c for c in columns if c not in keys]
+    if format == "parquet":
+        batches = pq.ParquetFile(path).iter_batches(chunk_rows, row_groups=row_groups, columns=stored)
+    else:
+        batches = ds.dataset(path, format="ipc").to_batches(columns=stored, batch_size=chunk_rows)
+    for batch in _rebatch(batches, chunk_rows):
+        chunk = batch.to_pandas()
+        for column, value in keys.items():
+            if column in columns:
+                chunk[column] = pd.Categorical.from_codes(np.zeros(len(chunk), dtype=np.int8), [value])
+        yield compact(table, chunk[columns])
+
+
+# Chunks of `columns` of a table, in the compact layout. File-backed
+# sources stream them from disk; others are sliced from the loaded table.
+def iter_chunks(source, table, columns, chunk_rows=CHUNK_ROWS):
+    if isinstance(source, ArrowSource):
+        for piece in _pieces(source, table, chunk_rows):
+            yield from _read_piece(source.format, table, piece, columns, chunk_rows)
+        return
+    df = source.load(table, columns)
+    for chunk in row_chunks(df, chunk_rows):
+        yield compact(table, chunk)
+
+
+def _merge_into(totals, partials, jobs):
+    for name, part in partials.items():
+        totals[name] = jobs[name].merge(totals[name], part) if name in totals else part
+    return totals
+
+
+def _reduce_chunks(jobs, chunks):
+    partials = {}
+    for chunk in chunks:
+        _merge_into(partials, {name: job.reduce(chunk[job.columns]) for name, job in jobs.items()}, jobs)
+    return partials
+
+
+def _reduce_piece(task):
+    format, table, piece, columns, jobs, chunk_rows = task
+    return _reduce_chunks(jobs, _read_piece(format, table, piece, columns, chunk_rows))
+
+
+# Run `jobs` (name -> Job) over their tables; returns name -> aggregate for
+# every job whose table had rows. workers=1 reduces in this process.
+def reduce(source, jobs, workers=None, chunk_rows=CHUNK_ROWS):
+    totals, tasks = {}, []
+    for table in dict.fromkeys(job.table for job in jobs.values()):
+        table_jobs = {name: job for name, job in jobs.items() if job.table == table}
+        columns = list(dict.fromkeys(c for job in table_jobs.values() for c in job.columns))
+        if isinstance(source, ArrowSource):
+            tasks += [(source.format, table, piece, columns, table_jobs, chunk_rows)
+                      for piece in _pieces(source, table, chunk_rows)]
+        else:
+            _merge_into(totals, _reduce_chunks(table_jobs, iter_chunks(source, table, columns, chunk_rows)), jobs)
+
+    pool = ProcessPoolExecutor(workers) if workers != 1 and len(tasks) > 1 else None
+    mapper = pool.map if pool is not None else map
+    try:
+        for partials in mapper(_reduce_piece, tasks):
+            _merge_into(totals, partials, jobs)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return totals
+
+
+# KPI cube of one table, streamed chunk by chunk
+def kpi_cube(source, table, workers=None):
+    name = f"kpi_{table}"
+    cube = reduce(source, {name: kpi_job(table)}, workers).get(name)
+    if cube is None:  # no rows at all
+        cube = aggregate(table, compact(table, pd.DataFrame({c: [] for c in cube_columns(table)})))
+    return cube
+
+
+# Reduce every summary job and publish the results to <output>/_aggregates/
+# (by default next to the source's files)
+def summarize(source, workers=None, chunk_rows=CHUNK_ROWS, output=None):
+    output = output or source.root
+    start = time.perf_counter()
+    aggregates = reduce(source, summary_jobs(), workers, chunk_rows)
+    for name, frame in aggregates.items():
+        write_ipc(frame.reset_index(), os.path.join(output, AGGREGATES_DIR, name + FORMATS["arrow"]))
+    return {
+        "aggregates": {name: len(frame) for name, frame in aggregates.items()},
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize an archive chunk by chunk into published aggregates.")
+    parser.add_argument("root", help="directory of Parquet/Arrow tables (see backends.ArrowSource)")
+    parser.add_argument("--format", choices=list(FORMATS), default="parquet")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--output", help="write _aggregates/ here instead of under root")
+    args = parser.parse_args(argv)
+
+    source = ArrowSource(args.root, args.format, out_of_core=True)
+    report = summarize(source, args.workers, args.chunk_rows, args.output)
+    for name, rows in report["aggregates"].items():
+        print(f"{name:32} {rows:>10,} rows")
+    print(f"summarized in {report['seconds']:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+# datasets.py
+# Dataset layer shared by every Streamlit session.
+# Streamlit reruns the whole script on each interaction, so tables are
+# memoized here (st.cache_resource-style: one shared object per key, not a
+# copy per session) and only rebuilt when their key changes or they are
+# explicitly invalidated. Cached frames are shared and must not be mutated.
+import os
+import threading
+from collections import OrderedDict
+
+from backends import TABLES, apply_filters, default_source, filters_key
+from instrumentation import section
+from schema import compact
+
+MAX_CACHE_BYTES = int(os.environ.get("INSUREAI_CACHE_MB", "2048")) * 2**20
+
+DATASETS = TABLES
+
+
+def _nbytes(value):
+    if hasattr(value, "memory_usage"):
+        usage = value.memory_usage(deep=True)  # per column for frames
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(item) for item in value)
+    if isinstance(value, dict):
+        return sum(_nbytes(item) for item in value.values())
+    return int(getattr(value, "nbytes", 0))
+
+
+# Consecutive slices of up to `rows` rows of a frame, for work that is done
+# a chunk at a time to bound memory or spread it over workers
+def row_chunks(df, rows):
+    for start in range(0, len(df), rows):
+        yield df.iloc[start:start + rows]
+
+
+class DatasetCache:
+    # Thread-safe LRU cache bounded by the total size of its entries.
+    # Each entry records the datasets it was derived from so invalidating a
+    # dataset also drops everything computed from it. Pinned entries hold
+    # state that cannot be rebuilt (e.g. ingested rows) and are never evicted.
+    def __init__(self, max_bytes=MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (value, nbytes, deps)
+        self._pinned = set()
+        self._loading = {}  # key -> lock held while the entry is built
+        self._lock = threading.Lock()
+
+    # size(value) gives the bytes an entry is charged; _nbytes by default
+    def get_or_load(self, key, loader, deps=(), pinned=False, size=_nbytes):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        # Concurrent sessions asking for the same key wait for one build
+        with load_lock:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key][0]
+                self.misses += 1
+            value = loader()
+            with self._lock:
+                self._entries[key] = (value, size(value), frozenset(deps))
+                if pinned:
+                    self._pinned.add(key)
+                self._loading.pop(key, None)
+                self._evict()
+        return value
+
+    def _evict(self):
+        # Least recently used first; always keep the most recent entry, even
+        # if it alone is over budget
+        excess = self.nbytes - self.max_bytes
+        for key in list(self._entries)[:-1]:
+            if excess <= 0:
+                break
+            if key not in self._pinned:
+                excess -= self._entries.pop(key)[1]
+
+    @property
+    def nbytes(self):
+        return sum(entry[1] for entry in self._entries.values())
+
+    def invalidate(self, dataset=None):
+        with self._lock:
+            if dataset is None:
+                self._entries.clear()
+                self._pinned.clear()
+                return
+            for key in [k for k, e in self._entries.items() if dataset in e[2]]:
+                del self._entries[key]
+                self._pinned.discard(key)
+
+    # (key, value) of every entry whose key satisfies `match`
+    def find(self, match):
+        with self._lock:
+            return [(key, entry[0]) for key, entry in self._entries.items() if match(key)]
+
+    def discard(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+                self._pinned.discard(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_cache = DatasetCache()
+
+
+_source = None
+
+
+def get_source():
+    global _source
+    if _source is None:
+        _source = default_source()
+    return _source
+
+
+def set_source(source):
+    global _source
+    _source = source
+    _cache.invalidate()
+
+
+def _load(name, load):
+    with section(f"load {name}", "data"):
+        return compact(name, load())
+
+
+# Load a dataset, optionally projected to `columns` and filtered with
+# DNF `filters` (see backends.apply_filters). File-backed sources push both
+# down to the scan; other sources load the full table once and slice it.
+# Either way the cached frame is stored in the compact schema.py layout.
+def get_dataset(name, columns=None, filters=None, source=None):
+    if name not in DATASETS:
+        raise KeyError(f"Unknown dataset: {name!r}")
+    source = source or get_source()
+    columns = list(columns) if columns else None
+
+    if source.pushdown:
+        key = (source.key(), name, tuple(columns or ()), filters_key(filters))
+        return _cache.get_or_load(key, lambda: _load(name, lambda: source.load(name, columns, filters)), deps=(name,))
+
+    df = _cache.get_or_load((source.key(), name, (), None), lambda: _load(name, lambda: source.load(name)), deps=(name,))
+    if filters:
+        key = (source.key(), name, (), filters_key(filters))
+        df = _cache.get_or_load(key, lambda: apply_filters(df, filters), deps=(name,))
+    return df[columns] if columns else df
+
+
+# Memoize a value derived from one or more datasets (aggregates, indexes...);
+# pass size(value) for values whose memory _nbytes cannot see
+def cached(key, loader, deps=(), pinned=False, size=_nbytes):
+    def build():
+        with section(f"build {key[0] if isinstance(key, tuple) else key}", "aggregate"):
+            return loader()
+
+    return _cache.get_or_load(key, build, deps=deps, pinned=pinned, size=size)
+
+
+# Memoize an index or rollup built from the frame `df` of table `name`.
+# `version` is the claims stream version for tables that grow (0 for the
+# others), paired with the filter state for filtered frames; entries are
+# keyed by it and the number of rows. Ingested tables only ever gain rows at
+# the end, so when extend(previous, start) is given a newer version extends
+# the latest cached one with rows start: instead of calling build(). Either
+# way the entries for older versions are dropped, with the frames they hold.
+def derived(kind, name, df, version, build, extend=None, params=(), deps=None, source=None):
+    prefix = (kind, (source or get_source()).key(), name, *params)
+    stream_version, state = version if isinstance(version, tuple) else (version, None)
+
+    def earlier(key):
+        if len(key) != len(prefix) + 2 or key[:len(prefix)] != prefix or key[-1] > len(df):
+            return False
+        v, s = key[-2] if isinstance(key[-2], tuple) else (key[-2], None)
+        return s == state and v < stream_version
+
+    def load():
+        previous = _cache.find(earlier) if stream_version else []
+        if extend is not None and previous:
+            key, value = max(previous, key=lambda item: item[0][-1])
+            value = value if key[-1] == len(df) else extend(value, key[-1])
+        else:
+            value = build()
+        _cache.discard([key for key, _ in previous])
+        return value
+
+    return cached((*prefix, version, len(df)), load, deps=deps or [name])
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+# One object per process for `name`, built by factory() on first use; for
+# the background services every session shares
+def shared(name, factory):
+    with _shared_lock:
+        if name not in _shared:
+            _shared[name] = factory()
+        return _shared[name]
+
+
+def invalidate(name=None):
+    if _source is not None:
+        _source.refresh(name)
+    _cache.invalidate(name)
+
+
+def cache_stats():
+    return _cache.stats()
@@ -0,0 +1,132 @@
+# entity_index.py
+# Indexed lookups for entity pickers and detail panels.
+# Each table gets a join index (relations.KeyIndex) on its integer ID key
+# for O(1) detail fetches and a sorted key array for prefix search, so pages
+# offer search-as-you-type over a handful of matches instead of listing every
+# ID in a selectbox and scanning the table with a boolean mask to find the
+# selected row. Ingested IDs are merged into both.
+import numpy as np
+import streamlit as st
+
+from datasets import derived
+from generators import format_ids
+from relations import KeyIndex
+from schema import ID_PREFIXES, parse_id
+
+ID_COLUMNS = {
+    "policies": "Policy ID",
+    "claims": "Claim ID",
+    "underwriting": "Case ID",
+    "marketing": "Opportunity ID",
+    "sales": "Sale ID",
+    "eapps": "Application ID",
+}
+SEARCH_LIMIT = 50
+
+
+# Sorted keys, the distinct keys and the row of the first occurrence of each
+def _keys(keys):
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    first = np.ones(len(keys), dtype=bool)
+    first[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    return sorted_keys, sorted_keys[first], order[first]
+
+
+class EntityIndex:
+    # keys: _keys() of the ID column, when already known
+    def __init__(self, df, column, keys=None):
+        self.df = df
+        self.column = column
+        self.prefix = ID_PREFIXES[column]
+        self._sorted, self._unique, self._rows = _keys(df[column].to_numpy()) if keys is None else keys
+        self._positions = KeyIndex(self._unique)
+
+    @property
+    def nbytes(self):
+        arrays = (self._sorted, self._unique, self._rows)
+        return sum(a.nbytes for a in arrays) + self._positions.nbytes + int(self.df.memory_usage(deep=True).sum())
+
+    # Index over `df`, the rows of this one's frame followed by rows start:
+    def extended(self, df, start):
+        keys = df[self.column].to_numpy()[start:]
+        new_sorted, new_unique, new_rows = _keys(keys)
+        at = np.searchsorted(self._sorted, new_sorted, side="right")
+        # IDs already in the table keep the row they were first seen in
+        unseen = self._positions.positions(new_unique) < 0
+        return EntityIndex(df, self.column, (
+            np.insert(self._sorted, at, new_sorted),
+            np.concatenate([self._unique, new_unique[unseen]]),
+            np.concatenate([self._rows, new_rows[unseen] + start]),
+        ))
+
+    def __len__(self):
+        return len(self._sorted)
+
+    # Row position for a formatted ID ("CLM20001") or integer key; the first
+    # row of a duplicated ID
+    def position(self, entity_id):
+        key = parse_id(self.column, entity_id)
+        if key is None:
+            return None
+        position = self._positions.positions([key])[0]
+        return None if position < 0 else int(self._rows[position])
+
+    # Row for an ID, or None if it is not in the table
+    def get(self, entity_id):
+        position = self.position(entity_id)
+        return None if position is None else self.df.iloc[position]
+
+    # Key ranges whose formatted IDs start with the typed text; the prefix
+    # letters may be typed in full, in part or left out
+    def _ranges(self, text):
+        text = text.strip().upper()
+        if text.startswith(self.prefix):
+            digits = text[len(self.prefix):]
+        elif self.prefix.startswith(text):
+            digits = ""
+        else:
+            digits = text
+        if not digits:
+            return [(None, None)]
+        if not digits.isdigit():
+            return []
+        if digits[0] == "0":
+            return [(0, 1)] if digits == "0" else []
+        widest = len(str(int(self._sorted[-1]))) if len(self._sorted) else 0
+        # "2000" matches 2000, 20000-20009, 200000-200099, ...
+        value = int(digits)
+        return [
+            (value * 10 ** extra, (value + 1) * 10 ** extra)
+            for extra in range(max(widest - len(digits) + 1, 0))
+        ]
+
+    # Up to `limit` matching IDs in key order, plus the total number of matches
+    def search(self, text, limit=SEARCH_LIMIT):
+        matches, total = [], 0
+        for low, high in self._ranges(text):
+            lo = 0 if low is None else np.searchsorted(self._sorted, low, side="left")
+            hi = len(self._sorted) if high is None else np.searchsorted(self._sorted, high, side="left")
+            matches.append(self._sorted[lo:min(hi, lo + max(limit - total, 0))])
+            total += int(hi - lo)
+        keys = np.concatenate(matches) if matches else self._sorted[:0]
+        return list(format_ids(self.prefix, keys[:limit])), total
+
+
+# Shared index for a dataset; see datasets.derived() for `version`
+def get_entity_index(name, df, version=0):
+    return derived("entity-index", name, df, version, lambda: EntityIndex(df, ID_COLUMNS[name]),
+                   lambda index, start: index.extended(df, start))
+
+
+# Search box plus a short selectbox of matching IDs; returns the selected
+# ID, or None when nothing matches
+def entity_picker(index, label, key, limit=SEARCH_LIMIT):
+    query = st.text_input(f"Search {index.column}", key=f"{key}_search", placeholder="Start typing an ID")
+    matches, total = index.search(query, limit)
+    if not matches:
+        st.warning(f"No {index.column} starts with '{query.strip()}'")
+        return None
+    if total > len(matches):
+        st.caption(f"Showing the first {len(matches)} of {total:,} matches; keep typing to narrow them down")
+    return st.selectbox(label, matches, key=key)
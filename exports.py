@@ -0,0 +1,241 @@
+# exports.py
+# Background exports of queues and reports.
+# Export jobs run on a small shared thread pool, never in the script
+# thread. Tables are written straight from the cached (shared, read-only)
+# frames a chunk of rows at a time: only the chunk being written is
+# formatted for output (IDs as "CLM20001" and so on), so memory stays
+# bounded by CHUNK_ROWS whatever the size of the table. Each job writes to
+# a temporary file under EXPORT_DIR that is renamed into place when
+# complete; pages poll the job's progress in a small fragment and offer
+# the file for download once it is ready. Finished exports are deleted
+# after EXPORT_TTL seconds.
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pcsv
+import pyarrow.parquet as pq
+import streamlit as st
+
+from datasets import row_chunks, shared
+from instrumentation import section
+from schema import display
+
+EXPORT_DIR = os.environ.get("INSUREAI_EXPORT_DIR", os.path.join(tempfile.gettempdir(), "insureai_exports"))
+EXPORT_TTL = 3600
+CHUNK_ROWS = 50_000
+EXCEL_MAX_ROWS = 1_048_575  # one header row plus data per worksheet
+
+
+# Categorical columns as plain values (CSV has no dictionary encoding) and
+# timestamps to the second
+def _plain_type(type):
+    if pa.types.is_dictionary(type):
+        return type.value_type
+    return pa.timestamp("s") if pa.types.is_timestamp(type) else type
+
+
+def _plain(schema):
+    return pa.schema([field.with_type(_plain_type(field.type)) for field in schema])
+
+
+# Arrow tables of the chunks, all with the schema of the first one
+def _tables(frame, plain=False):
+    schema = None
+    for chunk in map(display, row_chunks(frame, CHUNK_ROWS)):
+        table = pa.Table.from_pandas(chunk, preserve_index=False, schema=schema)
+        schema = table.schema
+        yield table.cast(_plain(schema), safe=False) if plain else table
+
+
+# Arrow's CSV and Parquet writers both take a stream of tables
+def _write_arrow(open_writer, plain, frame, path, progress):
+    writer = None
+    try:
+        for table in _tables(frame, plain):
+            if writer is None:
+                writer = open_writer(path, table.schema)
+            writer.write_table(table)
+            progress(table.num_rows)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:  # no rows: header or schema only
+        schema = pa.Schema.from_pandas(display(frame), preserve_index=False)
+        open_writer(path, _plain(schema) if plain else schema).close()
+
+
+def _write_csv(frame, path, progress):
+    _write_arrow(pcsv.CSVWriter, True, frame, path, progress)
+
+
+def _write_parquet(frame, path, progress):
+    _write_arrow(pq.ParquetWriter, False, frame, path, progress)
+
+
+def _cell(value):
+    if value is None or value is pd.NaT or (isinstance(value, float) and np.isnan(value)):
+        return None
+    return value.to_pydatetime() if isinstance(value, pd.Timestamp) else value
+
+
+# Excel needs openpyxl, which is optional; its write-only workbook streams
+# rows to disk instead of building the sheet in memory
+def _write_excel(frame, path, progress):
+    from openpyxl import Workbook
+
+    if len(frame) > EXCEL_MAX_ROWS:
+        raise ValueError(f"{len(frame):,} rows do not fit in one Excel sheet; export CSV or Parquet instead")
+    book = Workbook(write_only=True)
+    sheet = book.create_sheet()
+    sheet.append(list(frame.columns))
+    for chunk in map(display, row_chunks(frame, CHUNK_ROWS)):
+        for row in chunk.astype(object).itertuples(index=False):
+            sheet.append([_cell(value) for value in row])
+        progress(len(chunk))
+    book.save(path)
+
+
+def _write_text(lines, path, progress):
+    with open(path, "w", encoding="utf-8") as out:
+        for line in lines:
+            out.write(line + "\n")
+            progress(1)
+
+
+# Table formats: name -> (file extension, MIME type, writer)
+FORMATS = {
+    "CSV": (".csv", "text/csv", _write_csv),
+    "Parquet": (".parquet", "application/vnd.apache.parquet", _write_parquet),
+}
+if find_spec("openpyxl") is not None:
+    FORMATS["Excel"] = (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", _write_excel)
+
+
+class ExportJob:
+    def __init__(self, file_name, mime, total):
+        self.id = uuid.uuid4().hex
+        self.file_name = file_name
+        self.mime = mime
+        self.total = total
+        self.written = 0
+        self.path = os.path.join(EXPORT_DIR, f"{self.id}-{file_name}")
+        self.error = None
+        self.done = False
+        self.finished_at = None
+
+    @property
+    def progress(self):
+        return min(self.written / self.total, 1.0) if self.total else float(self.done)
+
+    # Contents of the finished file, read when the user downloads it
+    def read(self):
+        with open(self.path, "rb") as exported:
+            return exported.read()
+
+
+class ExportService:
+    def __init__(self, max_workers=2, ttl=EXPORT_TTL):
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="export")
+        self._jobs = {}  # id -> ExportJob
+        self._lock = threading.Lock()
+
+    # Start writing an export; write(source, path, progress) is one of the
+    # _write_* functions and total the number of rows or lines it writes
+    def submit(self, write, source, file_name, mime, total):
+        self._expire()
+        job = ExportJob(file_name, mime, total)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, write, source)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, write, source):
+        partial_path = job.path + ".part"
+
+        def progress(rows):
+            job.written += rows
+
+        try:
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            with section(f"export {job.file_name}", "export"):
+                write(source, partial_path, progress)
+            os.replace(partial_path, job.path)
+        except Exception as exc:
+            job.error = exc
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+        job.finished_at = time.monotonic()
+        job.done = True
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.ttl
+        with self._lock:
+            expired = [job for job in self._jobs.values() if job.done and job.finished_at < cutoff]
+            for job in expired:
+                del self._jobs[job.id]
+        for job in expired:
+            if os.path.exists(job.path):
+                os.remove(job.path)
+
+
+# The process-wide export worker pool; every session's jobs queue on it and
+# its workers are capped by INSUREAI_EXPORT_WORKERS
+def get_export_service():
+    return shared("exports", lambda: ExportService(max_workers=int(os.environ.get("INSUREAI_EXPORT_WORKERS", "2"))))
+
+
+# Export a table (e.g. a cached, filtered queue) in one of FORMATS
+def export_table(frame, name, format):
+    extension, mime, write = FORMATS[format]
+    return get_export_service().submit(write, frame, name + extension, mime, len(frame))
+
+
+# Export a text report given as a list of lines
+def export_text(lines, file_name):
+    return get_export_service().submit(_write_text, lines, file_name, "text/plain", len(lines))
+
+
+# Start button, progress while the job runs and the download once it is
+# ready. start() submits the job; `key` holds its ID in session state.
+def export_button(label, start, key):
+    job = get_export_service().get(st.session_state.get(key))
+    running = job is not None and not job.done
+    if st.button(label, key=f"{key}_start", disabled=running):
+        job = start()
+        st.session_state[key] = job.id
+        running = True
+
+    if running:
+        @st.fragment(run_every=0.5)
+        def show_progress():
+            if job.done:
+                st.rerun()
+            st.progress(job.progress, text=f"Writing {job.file_name}: {job.written:,} of {job.total:,}")
+
+        show_progress()
+    elif job is not None and job.error is not None:
+        st.error(f"Export of {job.file_name} failed: {job.error}")
+    elif job is not None:
+        st.download_button(f"Download {job.file_name}", data=job.read, file_name=job.file_name,
+                           mime=job.mime, key=f"{key}_download")
+
+
+# Format picker plus export_button for a whole table
+def export_panel(frame, name, key):
+    col1, col2 = st.columns([1, 3])
+    format = col1.selectbox("Export format", list(FORMATS), key=f"{key}_format", label_visibility="collapsed")
+    with col2:
+        export_button(f"Export {len(frame):,} rows", lambda: export_table(frame, name, format), key)
@@ -0,0 +1,264 @@
+# filters.py
+# Global filter bar: date range, product, region, agent and status, applied
+# to every page.
+# Each table gets a FilterIndex holding a packed bitmap (one bit per row)
+# for every value of the fields it can be filtered on. Claims take Product,
+# Agent and Region from the policy they were filed against, and tables
+# without a Region column take it through their agent. A filter combination
+# ORs the bitmaps of the selected values within a field, ANDs the fields and
+# the date range, and the filtered frame is cached per table version and
+# combination, so every page and chart shares one evaluation; claims
+# ingested since the last version are filtered on their own and appended.
+# Fields a table does not have leave it unfiltered, and a status only
+# filters the tables that use it.
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from datasets import cached, derived, get_dataset, get_source
+from ingestion import get_claims_stream
+from kpis import CUBES, KpiEngine, cube_columns, get_kpi_engine
+from relations import POLICY_COLUMNS, KeyIndex, Relations, agent_regions, get_relations, region_codes
+
+FIELDS = ["Product", "Region", "Agent", "Status"]
+
+DATE_COLUMNS = {
+    "policies": "Start Date",
+    "claims": "Date Filed",
+    "underwriting": "Date",
+    "sales": "Date",
+    "eapps": "Start Time",
+}
+PRODUCT_COLUMNS = {"marketing": "Product Interest"}
+
+
+def _categorical(values):
+    return values.cat.codes.to_numpy(), values.cat.categories
+
+
+class FilterIndex:
+    # fields: name -> (codes, categories); dates: datetime64 array or None
+    def __init__(self, size, fields, dates=None):
+        self.size = size
+        self.bitmaps = {
+            name: {category: np.packbits(codes == i) for i, category in enumerate(categories)}
+            for name, (codes, categories) in fields.items()
+        }
+        self.dates = dates
+
+    @property
+    def nbytes(self):
+        return sum(bits.nbytes for bitmaps in self.bitmaps.values() for bits in bitmaps.values())
+
+    # Boolean row mask for a filter state, or None when nothing applies
+    def mask(self, state):
+        bits, keep = None, None
+        for field, values in state:
+            if field == "Date":
+                if self.dates is not None:
+                    start, end = np.datetime64(values[0], "D"), np.datetime64(values[1], "D") + 1
+                    keep = (self.dates >= start) & (self.dates < end)
+                continue
+            if field not in self.bitmaps:
+                continue
+            chosen = [self.bitmaps[field][v] for v in values if v in self.bitmaps[field]]
+            if not chosen and field == "Status":
+                continue
+            selected = np.bitwise_or.reduce(chosen) if chosen else np.zeros((self.size + 7) // 8, np.uint8)
+            bits = selected if bits is None else bits & selected
+        if bits is not None:
+            selected = np.unpackbits(bits, count=self.size).view(bool)
+            keep = selected if keep is None else keep & selected
+        return keep
+
+
+def _regions(source):
+    def build():
+        return agent_regions(get_dataset("sales", columns=["Agent", "Region", "Premium"], source=source))
+
+    return cached(("agent-regions", source.key()), build, deps=["sales"])
+
+
+# Join index on Policy ID plus the Product, Agent and Region codes of every
+# policy, for filtering claims by the policy they were filed against
+def _policy_fields(source):
+    def build():
+        policies = get_dataset("policies", columns=["Policy ID", "Product", "Agent"], source=source)
+        fields = {
+            "Product": _categorical(policies["Product"]),
+            "Agent": _categorical(policies["Agent"]),
+            "Region": region_codes(policies["Agent"], _regions(source)),
+        }
+        return KeyIndex(policies["Policy ID"].to_numpy()), fields
+
+    return cached(("policy-fields", source.key()), build, deps=["policies", "sales"])
+
+
+def _fields(table, df, source):
+    fields = {}
+    if table == "claims":
+        policy_index, policy_fields = _policy_fields(source)
+        position = policy_index.positions(df["Policy ID"].to_numpy())
+        for field, (codes, categories) in policy_fields.items():
+            fields[field] = (np.where(position >= 0, codes[position], -1), categories)
+    else:
+        product = PRODUCT_COLUMNS.get(table, "Product")
+        if product in df.columns:
+            fields["Product"] = _categorical(df[product])
+        if "Agent" in df.columns:
+            fields["Agent"] = _categorical(df["Agent"])
+            fields["Region"] = _categorical(df["Region"]) if "Region" in df.columns \
+                else region_codes(df["Agent"], _regions(source))
+    if "Status" in df.columns:
+        fields["Status"] = _categorical(df["Status"])
+    return fields
+
+
+def _filter_index(table, df, source):
+    dates = df[DATE_COLUMNS[table]].to_numpy() if table in DATE_COLUMNS else None
+    return FilterIndex(len(df), _fields(table, df, source), dates)
+
+
+# Shared filter index over a full table; see datasets.derived() for `version`
+def get_filter_index(table, df, version=0):
+    return derived("filter-index", table, df, version, lambda: _filter_index(table, df, get_source()),
+                   deps=_deps(table))
+
+
+# Claims and policies are filtered through policy and agent attributes too
+def _deps(table):
+    return [table] + (["policies", "sales"] if table in ("claims", "policies") else [])
+
+
+# The sidebar selections as a hashable state, or None when nothing is set
+def current():
+    state = []
+    dates = st.session_state.get("filter_dates")
+    if dates and len(dates) == 2:
+        state.append(("Date", tuple(dates)))
+    for field in FIELDS:
+        values = st.session_state.get(f"filter_{field.lower()}")
+        if values:
+            state.append((field, tuple(sorted(values))))
+    return tuple(state) or None
+
+
+# Cache version for things built from filtered frames
+def view_version(version=0):
+    state = current()
+    return (version, state) if state else version
+
+
+# Row mask of a full table under the current filters, or None
+def mask(table, df, version=0):
+    state = current()
+    return get_filter_index(table, df, version).mask(state) if state else None
+
+
+# A full table under the current filters (the table itself when none apply).
+# Ingested rows are filtered on their own and appended to the last result.
+def filtered(table, df, version=0):
+    state = current()
+    if not state:
+        return df
+
+    def build():
+        keep = get_filter_index(table, df, version).mask(state)
+        return df if keep is None else df[keep]
+
+    def extend(previous, start):
+        new = df.iloc[start:]
+        keep = _filter_index(table, new, get_source()).mask(state)
+        return pd.concat([previous, new if keep is None else new[keep]])
+
+    return derived("filtered", table, df, (version, state), build, extend, deps=_deps(table))
+
+
+# KPI engine over the filtered tables (the shared engine when unfiltered)
+def filtered_kpi_engine():
+    state = current()
+    if not state:
+        return get_kpi_engine()
+    stream = get_claims_stream()
+
+    def build():
+        engine = KpiEngine()
+        for table in CUBES:
+            if table == "claims":
+                df = filtered(table, stream.frame(), stream.version)
+            else:
+                df = filtered(table, get_dataset(table))
+            engine.update(table, df[cube_columns(table)])
+        # Charts are cached by engine version; a fresh engine must not reuse
+        # the version of one built before claims were ingested
+        engine.version = stream.version
+        return engine
+
+    return cached(("kpis-filtered", get_source().key(), stream.version, state), build, deps=list(CUBES))
+
+
+# Claims joined to policies within the filtered tables
+def filtered_relations(stream):
+    state = current()
+    if not state:
+        return get_relations(stream)
+    source = get_source()
+
+    def build():
+        policies = filtered("policies", get_dataset("policies"))[POLICY_COLUMNS]
+        relations = Relations(policies, filtered("sales", get_dataset("sales")), _regions(source))
+        relations.add_claims(filtered("claims", stream.frame(), stream.version))
+        relations.version = stream.version
+        return relations
+
+    key = ("relations-filtered", source.key(), stream.version, state)
+    return cached(key, build, deps=["claims", "policies", "sales"])
+
+
+# Tables and columns whose categories are offered for each field
+OPTION_COLUMNS = {
+    "Product": [("policies", "Product"), ("sales", "Product"), ("eapps", "Product")],
+    "Region": [("sales", "Region")],
+    "Agent": [("policies", "Agent"), ("sales", "Agent")],
+    "Status": [("policies", "Status"), ("claims", "Status"), ("underwriting", "Status"), ("eapps", "Status")],
+}
+
+
+# Options for each field, read from single categorical columns
+def _options():
+    source = get_source()
+
+    def categories(table, column):
+        return list(get_dataset(table, columns=[column], source=source)[column].cat.categories)
+
+    def build():
+        return {
+            field: list(dict.fromkeys(c for table, column in columns for c in categories(table, column)))
+            for field, columns in OPTION_COLUMNS.items()
+        }
+
+    tables = sorted({table for columns in OPTION_COLUMNS.values() for table, _ in columns})
+    return cached(("filter-options", source.key()), build, deps=tables)
+
+
+def _clear():
+    for key in ["filter_dates"] + [f"filter_{field.lower()}" for field in FIELDS]:
+        st.session_state.pop(key, None)
+
+
+# Render the filter bar in the sidebar. Options are only loaded while the
+# bar is open or filters are set, so pages that are never filtered do not
+# pay for reading every table.
+def filter_bar():
+    active = current()
+    expander = st.sidebar.expander("Filters", expanded=bool(active), key="filter_open", on_change="rerun")
+    with expander:
+        if not expander.open and not active:
+            return
+        options = _options()
+        st.date_input("Date range", value=[], key="filter_dates")
+        for field in FIELDS:
+            st.multiselect(field, options[field], key=f"filter_{field.lower()}")
+        st.button("Clear filters", on_click=_clear, disabled=not active)
+        st.caption("Apply to every page. Tables without a field (e.g. Region for "
+                   "underwriting cases) are not filtered on it.")
@@ -0,0 +1,169 @@
+# fraud_rules.py
+# Vectorized fraud-rule engine behind the Fraud Detection tab.
+# Each rule looks at the whole claims table at once (sorted-key window
+# counts, per-type quantiles, a join to policies) and returns a boolean
+# flag plus the value that triggered it; evaluate() runs every rule, times
+# it and combines the flags into a weighted score. When claims are ingested,
+# extend() re-runs each rule only over the rows its result can change: the
+# new claims, every claim on their policies, or the whole table.
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from datasets import derived, get_dataset, get_source
+from relations import KeyIndex
+
+FREQUENCY_WINDOW_DAYS = 30
+FREQUENCY_MIN_CLAIMS = 2
+AMOUNT_QUANTILE = 0.95
+EARLY_CLAIM_DAYS = 30
+
+# scope: the rows a rule's result for one claim depends on: "claim" (only
+# itself), "policy" (the claims on the same policy) or "table" (all claims)
+FraudRule = namedtuple("FraudRule", ["name", "label", "weight", "evaluate", "scope"])
+FraudReport = namedtuple("FraudReport", ["flags", "details", "score", "timings"])
+
+
+def _days(dates):
+    return dates.to_numpy(dtype="datetime64[D]").astype(np.int64)
+
+
+# Claims on the same policy within the trailing window, counted with two
+# searchsorted calls over (policy, day) keys instead of a per-policy loop
+def frequent_claims(claims, policies):
+    codes, _ = pd.factorize(claims["Policy ID"])
+    days = _days(claims["Date Filed"])
+    span = int(days.max() - days.min()) + FREQUENCY_WINDOW_DAYS + 1 if len(days) else 1
+    keys = codes.astype(np.int64) * span + (days - (days.min() if len(days) else 0))
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    count = (
+        np.searchsorted(sorted_keys, keys, side="right")
+        - np.searchsorted(sorted_keys, keys - FREQUENCY_WINDOW_DAYS, side="left")
+    )
+    count = pd.Series(count, index=claims.index)
+    return count >= FREQUENCY_MIN_CLAIMS, count
+
+
+# Amounts above the AMOUNT_QUANTILE of their claim Type; np.quantile per
+# type code rather than a groupby, which sorts every group
+def amount_outlier(claims, policies):
+    types = claims["Type"].astype("category").cat
+    codes = types.codes.to_numpy()
+    amount = claims["Amount"].to_numpy(np.float64)
+    # One row per type plus a last all-NaN row, which code -1 (no type) picks
+    cutoffs = np.full((len(types.categories) + 1, 2), np.nan)
+    for code in range(len(types.categories)):
+        values = amount[codes == code]
+        values = values[~np.isnan(values)]
+        if len(values):
+            cutoffs[code] = np.quantile(values, [AMOUNT_QUANTILE, 0.5])
+    threshold, median = cutoffs[codes].T
+    return pd.Series(amount > threshold, index=claims.index), pd.Series(amount / median, index=claims.index)
+
+
+# Claims filed soon after the policy started, or outside its coverage
+# period; policies are joined on Policy ID through a KeyIndex
+def early_claim(claims, policies):
+    position = KeyIndex(policies["Policy ID"].to_numpy()).positions(claims["Policy ID"].to_numpy())
+    matched = position >= 0
+    safe = np.where(matched, position, 0)
+    filed = _days(claims["Date Filed"])
+    since_start = filed - _days(policies["Start Date"].iloc[safe])
+    after_end = filed > _days(policies["End Date"].iloc[safe])
+    flagged = matched & ((since_start <= EARLY_CLAIM_DAYS) | after_end)
+    since_start = pd.Series(np.where(matched, since_start, np.nan), index=claims.index)
+    return pd.Series(flagged, index=claims.index), since_start
+
+
+def model_flag(claims, policies):
+    flagged = claims["AI Flag"] == "High Risk"
+    return flagged, claims["AI Flag"]
+
+
+RULES = [
+    FraudRule("frequent_claims", f"Multiple claims on the policy within {FREQUENCY_WINDOW_DAYS} days", 2.0,
+              frequent_claims, "policy"),
+    FraudRule("amount_outlier", f"Amount above the {AMOUNT_QUANTILE:.0%} percentile for the claim type", 1.5,
+              amount_outlier, "table"),
+    FraudRule("early_claim", f"Filed within {EARLY_CLAIM_DAYS} days of policy start or outside coverage", 2.0,
+              early_claim, "claim"),
+    FraudRule("model_flag", "Flagged high risk by the AI model", 1.0, model_flag, "claim"),
+]
+
+
+def _report(claims, flags, details, timings, rules):
+    flags = pd.DataFrame(flags, index=claims.index)
+    weights = np.array([rule.weight for rule in rules])
+    score = pd.Series(flags.to_numpy(dtype=np.float64) @ weights, index=claims.index, name="Fraud Score")
+    return FraudReport(flags, pd.DataFrame(details, index=claims.index), score, timings)
+
+
+def evaluate(claims, policies, rules=RULES):
+    flags, details, timings = {}, {}, {}
+    for rule in rules:
+        start = time.perf_counter()
+        flags[rule.name], details[rule.name] = rule.evaluate(claims, policies)
+        timings[rule.name] = time.perf_counter() - start
+    return _report(claims, flags, details, timings, rules)
+
+
+# Positions of the rows a rule must re-run over when rows start: are new,
+# or None for the whole table
+def _affected(rule, claims, start):
+    if rule.scope == "claim":
+        return np.arange(start, len(claims))
+    if rule.scope == "policy":
+        new_policies = claims["Policy ID"].iloc[start:].unique()
+        return np.flatnonzero(claims["Policy ID"].isin(new_policies).to_numpy())
+    return None
+
+
+# A report's column with the re-run rows replaced and the new rows added
+def _patch(column, update, rows, start):
+    new = rows >= start
+    patched = pd.concat([column, update[new]])
+    if not new.all():
+        patched.iloc[rows[~new]] = update[~new].to_numpy()
+    return patched
+
+
+# `report` for claims[:start], brought up to date with the rows after it
+def extend(report, claims, start, policies, rules=RULES):
+    flags, details, timings = {}, {}, {}
+    for rule in rules:
+        begin = time.perf_counter()
+        rows = _affected(rule, claims, start)
+        if rows is None:
+            flags[rule.name], details[rule.name] = rule.evaluate(claims, policies)
+        else:
+            flag, detail = rule.evaluate(claims.iloc[rows], policies)
+            flags[rule.name] = _patch(report.flags[rule.name], flag, rows, start)
+            details[rule.name] = _patch(report.details[rule.name], detail, rows, start)
+        timings[rule.name] = time.perf_counter() - begin
+    return _report(claims, flags, details, timings, rules)
+
+
+# Human-readable reasons for one claim's fired rules
+def reasons(report, index, rules=RULES):
+    labels = []
+    for rule in rules:
+        if report.flags.at[index, rule.name]:
+            labels.append(rule.label)
+    return labels
+
+
+# Report for the current claims stream, extended when claims are ingested
+# and recomputed when either table is invalidated
+def get_fraud_report(stream, source=None):
+    source = source or get_source()
+    version, claims = stream.snapshot()
+
+    def policies():
+        return get_dataset("policies", columns=["Policy ID", "Start Date", "End Date"], source=source)
+
+    return derived("fraud", "claims", claims, version, lambda: evaluate(claims, policies()),
+                   lambda report, start: extend(report, claims, start, policies()),
+                   deps=["claims", "policies"], source=source)
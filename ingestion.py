@@ -0,0 +1,111 @@
+# ingestion.py
+# Append-only claims ingestion.
+# New claims arrive in batches; ClaimsStream keeps the most recent claims
+# up to date from each batch alone, so an update costs O(batch). Pages read
+# the maintained views, or just the rows added since they last looked: the
+# KPI cubes fold those rows in when they are read, and indexes built from
+# the claims table are extended from them (see datasets.derived()) instead
+# of rebuilt. Out-of-core sources never load the archived claims: their
+# stream starts empty, aggregates come from the archive's chunked summaries
+# plus the ingested rows, and claim lists show ingested claims only.
+import threading
+from collections import deque
+
+import pandas as pd
+
+from datasets import cached, get_dataset, get_source
+from generators import DEFAULT_SIZES, generate_claims
+from schema import compact
+
+LATEST_ROWS = 50
+
+
+class ClaimsStream:
+    # archived_rows: claims on disk that are not in `claims`, so new IDs
+    # continue after them
+    def __init__(self, claims, archived_rows=0, max_history=100):
+        self.version = 0
+        self.initial_rows = len(claims)
+        self.rows = archived_rows + len(claims)
+        self._columns = list(claims.columns)
+        self._base = claims
+        self._pending = []  # batches not yet folded into _base
+        self._latest = claims.nlargest(LATEST_ROWS, "Date Filed")
+        self._history = deque(maxlen=max_history)  # (version, batch)
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        frames = [self._base] + self._pending
+        return sum(int(f.memory_usage(deep=True).sum()) for f in frames)
+
+    # Add a batch of new claims; returns the new stream version
+    def append(self, batch):
+        missing = set(self._columns) - set(batch.columns)
+        if missing:
+            raise ValueError(f"Claims batch is missing columns: {sorted(missing)}")
+        batch = compact("claims", batch[self._columns])
+        with self._lock:
+            self._pending.append(batch)
+            self._latest = pd.concat([self._latest, batch]).nlargest(LATEST_ROWS, "Date Filed")
+            self.rows += len(batch)
+            self.version += 1
+            self._history.append((self.version, batch))
+            return self.version
+
+    def latest(self, n=5):
+        return self._latest.head(n)
+
+    def _fold(self):
+        if self._pending:
+            self._base = pd.concat([self._base] + self._pending, ignore_index=True)
+            self._pending = []
+        return self._base
+
+    # Full claims table; pending batches are folded in only when asked for
+    def frame(self):
+        with self._lock:
+            return self._fold()
+
+    # The current version and full claims table, read together
+    def snapshot(self):
+        with self._lock:
+            return self.version, self._fold()
+
+    # Rows appended after `version`, or None if that is older than the
+    # retained history and the caller must reload the full frame
+    def since(self, version):
+        return self.changes(version)[1]
+
+    # The current version and every row appended since the stream was built
+    def appended(self):
+        with self._lock:
+            return self.version, self._fold().iloc[self.initial_rows:]
+
+    # since(), together with the version the returned rows bring you up to
+    def changes(self, version):
+        with self._lock:
+            if version >= self.version:
+                return self.version, self._base.iloc[:0]
+            if not self._history or version < self._history[0][0] - 1:
+                return self.version, None
+            batches = [batch for v, batch in self._history if v > version]
+            return self.version, pd.concat(batches, ignore_index=True)
+
+
+# Shared stream over the current claims dataset
+def get_claims_stream(source=None):
+    source = source or get_source()
+
+    def build():
+        if source.out_of_core:
+            return ClaimsStream(compact("claims", generate_claims(0)), archived_rows=source.count_rows("claims"))
+        return ClaimsStream(get_dataset("claims", source=source))
+
+    return cached(("claims-stream", source.key()), build, deps=["claims"], pinned=True)
+
+
+# Simulate a batch of claims filed today, continuing the stream's IDs
+def simulate_batch(stream, num=10, seed=None):
+    sizes = getattr(get_source(), "sizes", DEFAULT_SIZES)
+    return generate_claims(num, sizes["policies"], seed=seed, start=stream.rows, max_age_days=0)
@@ -0,0 +1,189 @@
+# instrumentation.py
+# Opt-in hot-path instrumentation for the dashboard.
+# When enabled (INSUREAI_DIAGNOSTICS=1, or ?diagnostics=1 in the URL) every
+# rerun is recorded as a run: section() blocks around data loads, cached
+# aggregations, page render blocks and Plotly figure construction add their
+# wall time to the current run. The process-wide hooks are only installed
+# by the environment flag, never by a URL: with it, st.* element calls and
+# Plotly Express builders are timed too, tracemalloc adds the change in
+# traced memory, and AI batches running on the inference threads are kept
+# in a background log. The hidden Diagnostics page shows both; runs can be
+# exported as JSON lines, or appended to INSUREAI_DIAGNOSTICS_LOG as they
+# finish. Disabled, section() costs one attribute lookup.
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+ENV_FLAG = "INSUREAI_DIAGNOSTICS"
+LOG_PATH = os.environ.get("INSUREAI_DIAGNOSTICS_LOG")
+TRACE_MEMORY = os.environ.get("INSUREAI_DIAGNOSTICS_MEMORY", "1") != "0"
+MAX_RUNS = 200
+
+# Element and figure calls timed once instrumentation is switched on
+ST_CALLS = ["dataframe", "plotly_chart", "line_chart", "bar_chart", "metric"]
+PX_CALLS = ["bar", "line", "pie"]
+
+_local = threading.local()
+_runs = deque(maxlen=MAX_RUNS)
+_background = deque(maxlen=MAX_RUNS)
+_lock = threading.Lock()
+_active = False
+
+
+def _process_wide():
+    return os.environ.get(ENV_FLAG) == "1"
+
+
+def enabled():
+    if _process_wide():
+        return True
+    import streamlit as st
+
+    try:
+        return st.query_params.get("diagnostics") == "1"
+    except Exception:
+        return False
+
+
+def _memory():
+    return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+
+def _timed(fn, name, kind):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with section(name, kind):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+# Wrap the st.* element calls and Plotly Express figure builders and start
+# tracing memory, once per process, when the environment flag is set
+def _activate():
+    global _active
+    with _lock:
+        if _active:
+            return
+        import plotly.express as px
+        import streamlit as st
+
+        for name in ST_CALLS:
+            setattr(st, name, _timed(getattr(st, name), f"st.{name}", "render"))
+        for name in PX_CALLS:
+            setattr(px, name, _timed(getattr(px, name), f"px.{name}", "plotly"))
+        if TRACE_MEMORY and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _active = True
+
+
+# Begin recording this rerun; returns None when instrumentation is off
+def start_run(page):
+    _local.run = None
+    if not enabled():
+        return None
+    if _process_wide():
+        _activate()
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    _local.depth = 0
+    _local.run = {
+        "session": ctx.session_id if ctx else None,
+        "page": page,
+        "started": time.time(),
+        "sections": [],
+        "_start": time.perf_counter(),
+        "_memory": _memory(),
+    }
+    return _local.run
+
+
+def end_run():
+    run = getattr(_local, "run", None)
+    if run is None:
+        return
+    _local.run = None
+    run["seconds"] = time.perf_counter() - run.pop("_start")
+    start_memory = run.pop("_memory")
+    run["net_mb"] = (_memory() - start_memory) / 2**20
+    run["peak_mb"] = (tracemalloc.get_traced_memory()[1] - start_memory) / 2**20 if tracemalloc.is_tracing() else None
+    with _lock:
+        _runs.append(run)
+    if LOG_PATH:
+        with open(LOG_PATH, "a") as f:
+            f.write(json.dumps(run) + "\n")
+
+
+# Time a block and record it on the current run. Outside a recorded rerun
+# (e.g. on the inference threads) blocks go to the background log, but only
+# once the environment flag has switched instrumentation on.
+@contextmanager
+def section(name, kind="block"):
+    run = getattr(_local, "run", None)
+    if run is None and (not _active or _in_script()):
+        yield
+        return
+    depth = getattr(_local, "depth", 0)
+    _local.depth = depth + 1
+    before = _memory()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _local.depth = depth
+        event = {
+            "name": name,
+            "kind": kind,
+            "depth": depth,
+            "seconds": time.perf_counter() - start,
+            "net_mb": (_memory() - before) / 2**20,
+        }
+        if run is not None:
+            event["offset"] = start - run["_start"]
+            run["sections"].append(event)
+        else:
+            event["thread"] = threading.current_thread().name
+            event["at"] = time.time()
+            with _lock:
+                _background.append(event)
+
+
+def _in_script():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    return get_script_run_ctx(suppress_warning=True) is not None
+
+
+def runs(session=None):
+    with _lock:
+        return [r for r in _runs if session is None or r["session"] == session]
+
+
+def background():
+    with _lock:
+        return list(_background)
+
+
+def clear():
+    with _lock:
+        _runs.clear()
+        _background.clear()
+
+
+# Recorded runs (and background events) as JSON lines
+def export_logs(path=None, session=None):
+    lines = [json.dumps({"type": "run", **r}) for r in runs(session)]
+    lines += [json.dumps({"type": "background", **e}) for e in background()]
+    text = "\n".join(lines) + "\n" if lines else ""
+    if path:
+        with open(path, "w") as f:
+            f.write(text)
+    return text
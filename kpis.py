@@ -0,0 +1,210 @@
+# kpis.py
+# KPI engine for the Dashboard Overview.
+# Each table is reduced once, the first time a page reads it, into a small
+# materialized cube (counts and sums by its categorical dimensions and
+# month). KPIs and overview charts are read
+# from the cubes, so their cost depends on the number of categories, not the
+# number of rows, and new rows are folded in with update() instead of a
+# full recompute. Ingested claims are pulled from the claims stream when the
+# claims cube is read, so an engine rebuilt after an invalidation catches up
+# with every row ingested before it.
+import threading
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from datasets import cached, get_dataset, get_source
+from ingestion import get_claims_stream
+
+CUBES = {
+    "policies": {"dims": ["Product", "Status", "Agent"], "date": "Start Date", "measures": ["Premium"]},
+    "claims": {"dims": ["Type", "Status", "AI Flag"], "date": "Date Filed", "measures": ["Amount"]},
+    "sales": {"dims": ["Product", "Region", "Agent"], "date": "Date", "measures": ["Premium", "Commission"]},
+    "eapps": {"dims": ["Product", "Status"], "date": "Start Time", "measures": ["Completion %"]},
+}
+
+PAID_CLAIM_STATUSES = ["Approved", "Paid"]
+SUBMITTED_EAPP_STATUSES = ["Submitted", "Under Review", "Approved", "Declined"]
+
+
+def cube_columns(table):
+    spec = CUBES[table]
+    return spec["dims"] + [spec["date"]] + spec["measures"]
+
+
+# Reduce a batch of rows to cube cells: count plus measure sums per
+# (dims..., Month)
+def aggregate(table, df):
+    spec = CUBES[table]
+    month = pd.Series(df[spec["date"]].values.astype("datetime64[M]"), index=df.index, name="Month")
+    # Sum in float64; measures are stored as float32/int8
+    measures = df[spec["measures"]].astype(np.float64)
+    grouped = measures.groupby([df[d] for d in spec["dims"]] + [month], observed=True, sort=False)
+    cube = grouped.sum()
+    cube["count"] = grouped.size()
+    return cube
+
+
+# Partial cubes (from batches or chunks of a table) merge by adding cells
+def merge_cubes(cube, partial):
+    if cube is None:
+        return partial
+    levels = list(range(cube.index.nlevels))
+    return pd.concat([cube, partial]).groupby(level=levels, observed=True, sort=False).sum()
+
+
+def _change(current, previous):
+    if not previous:
+        return None
+    return f"{(current - previous) / previous:+.1%} vs last month"
+
+
+class KpiEngine:
+    # loader(table), if given, builds a table's cube the first time it is
+    # read, so a page only pays for the tables it shows. streams maps tables
+    # that grow to a function returning their stream (see ingestion.py).
+    def __init__(self, loader=None, streams=None):
+        self.cubes = {}
+        self.loader = loader
+        self.streams = streams or {}
+        self.version = 0
+        self._synced = {}  # table -> stream version folded in so far
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+
+    def _loaded(self, table):
+        if table not in self.cubes and self.loader is not None:
+            self.cubes[table] = self.loader(table)
+        return self.cubes.get(table)
+
+    # Fold new rows of `table` into its cube
+    def update(self, table, rows):
+        partial = aggregate(table, rows)
+        with self._lock:
+            self.cubes[table] = merge_cubes(self._loaded(table), partial)
+            self.version += 1
+
+    @property
+    def nbytes(self):
+        return sum(int(c.memory_usage(deep=True).sum()) for c in self.cubes.values())
+
+    # Fold in the rows appended to a table's stream since the last sync: the
+    # batches in the stream's history, or, in a new engine or after a gap in
+    # the history, every row appended on top of the loaded cube
+    def _sync(self, table, stream):
+        with self._sync_lock:
+            synced = self._synced.get(table)
+            if synced == stream.version:
+                return
+            version, rows = stream.changes(synced) if synced is not None else (None, None)
+            if rows is None:
+                if synced is not None:
+                    with self._lock:
+                        self.cubes.pop(table, None)
+                version, rows = stream.appended()
+            if len(rows):
+                self.update(table, rows[cube_columns(table)])
+            self._synced[table] = version
+
+    def cube(self, table):
+        if table in self.streams:
+            self._sync(table, self.streams[table]())
+        with self._lock:
+            cube = self._loaded(table)
+        if cube is None:
+            raise KeyError(f"No KPI cube for {table!r}")
+        return cube
+
+    # Sum of `measure` (or the row count) by one dimension
+    def total(self, table, by, measure="count"):
+        return self.cube(table).groupby(level=by, observed=True, sort=True)[measure].sum()
+
+    # Mean of `measure` by one dimension
+    def average(self, table, by, measure):
+        cells = self.cube(table).groupby(level=by, observed=True, sort=True)[[measure, "count"]].sum()
+        return cells[measure] / cells["count"]
+
+    def monthly(self, table, measure="count"):
+        return self.cube(table).groupby(level="Month", observed=True, sort=True)[measure].sum()
+
+    def active_policies(self):
+        by_status = self.total("policies", "Status")
+        return int(by_status.get("Active", 0))
+
+    def policies_started(self, month):
+        monthly = self.monthly("policies")
+        return int(monthly.get(month, 0))
+
+    def claims_in_month(self, month):
+        return int(self.monthly("claims").get(month, 0))
+
+    def severity(self, month=None):
+        cube = self.cube("claims")
+        if month is not None:
+            cube = cube[cube.index.get_level_values("Month") == month]
+        count = cube["count"].sum()
+        return float(cube["Amount"].sum() / count) if count else 0.0
+
+    def loss_ratio(self):
+        claims = self.cube("claims")
+        paid = claims[claims.index.get_level_values("Status").isin(PAID_CLAIM_STATUSES)]
+        premium = self.cube("policies")["Premium"].sum()
+        return float(paid["Amount"].sum() / premium) if premium else 0.0
+
+    def eapp_completion_rate(self):
+        by_status = self.total("eapps", "Status")
+        total = by_status.sum()
+        submitted = by_status[by_status.index.isin(SUBMITTED_EAPP_STATUSES)].sum()
+        return float(submitted / total) if total else 0.0
+
+    # Everything the Overview KPI row shows, as (label, value, delta)
+    def overview(self, today=None):
+        month = np.datetime64(today or "today", "M")
+        last_month = month - 1
+        claims = self.claims_in_month(month)
+        severity = self.severity(month)
+        return [
+            ("Active Policies", f"{self.active_policies():,}",
+             f"+{self.policies_started(month):,} started this month"),
+            ("Claims This Month", f"{claims:,}", _change(claims, self.claims_in_month(last_month))),
+            ("Loss Ratio", f"{self.loss_ratio():.1%}", None),
+            ("Avg Claim Severity", f"${severity:,.0f}", _change(severity, self.severity(last_month))),
+            ("eApp Completion Rate", f"{self.eapp_completion_rate():.0%}", None),
+        ]
+
+
+# Index levels of a table's cube, for cubes stored as flat frames
+def cube_levels(table):
+    return CUBES[table]["dims"] + ["Month"]
+
+
+# Start from the cube published with the data (see shared_data.py and
+# chunked.py) where the source has one. Otherwise aggregate the table, or,
+# for sources too large to load, stream it through chunked reductions.
+def load_cube(source, table):
+    published = source.load_aggregate(f"kpi_{table}")
+    if published is not None:
+        return published.set_index(cube_levels(table))
+    if source.out_of_core:
+        from chunked import kpi_cube
+
+        return kpi_cube(source, table)
+    return aggregate(table, get_dataset(table, columns=cube_columns(table), source=source))
+
+
+# Engine whose cubes are loaded on first use
+def build_kpi_engine(source=None, streams=None):
+    source = source or get_source()
+    return KpiEngine(partial(load_cube, source), streams)
+
+
+# Shared engine for the current source, rebuilt when any input is
+# invalidated, with the claims stream's rows folded in as they are read
+def get_kpi_engine(source=None):
+    source = source or get_source()
+
+    def build():
+        return build_kpi_engine(source, {"claims": partial(get_claims_stream, source)})
+
+    return cached(("kpis", source.key()), build, deps=list(CUBES))
@@ -0,0 +1,210 @@
+# relations.py
+# Relational layer linking claims to the policies they were filed against,
+# and through them to products, agents, regions and customers.
+# A join index over the integer Policy ID keys maps each claim to its
+# policy's row once; claim counts and claimed/paid amounts are then folded
+# into per-policy totals, so loss ratio and premium-vs-paid breakdowns are
+# bincounts over the policies' category codes. Newly ingested claims are
+# joined and folded in on their own, and an out-of-core archive's claims are
+# streamed in chunk by chunk. Policies carry no region, so each agent's
+# region is the one they write the most sales premium in.
+import threading
+
+import numpy as np
+import pandas as pd
+
+from datasets import cached, get_dataset, get_source
+from kpis import PAID_CLAIM_STATUSES
+
+POLICY_COLUMNS = ["Policy ID", "Holder", "Product", "Agent", "Premium"]
+DIMENSIONS = ["Product", "Agent", "Region"]
+
+# Direct addressing is used while the key range is at most this many times
+# the number of keys; sparser keys fall back to a hash index
+DENSE_FACTOR = 4
+
+
+# Join index on a table's unique integer key: positions(keys) gives the row
+# of each key, or -1 where there is none
+class KeyIndex:
+    def __init__(self, keys):
+        keys = np.asarray(keys)
+        self._low = int(keys.min()) if len(keys) else 0
+        span = int(keys.max()) - self._low + 1 if len(keys) else 0
+        if span <= DENSE_FACTOR * len(keys) + 1024:
+            self._slots = np.full(span, -1, dtype=np.int32)
+            self._slots[keys - self._low] = np.arange(len(keys), dtype=np.int32)
+            if np.count_nonzero(self._slots >= 0) != len(keys):
+                raise ValueError("Join keys must be unique")
+            self._hash = None
+        else:
+            self._slots = None
+            self._hash = pd.Index(keys)
+            if not self._hash.is_unique:
+                raise ValueError("Join keys must be unique")
+
+    @property
+    def nbytes(self):
+        return self._slots.nbytes if self._slots is not None else self._hash.nbytes
+
+    def positions(self, keys):
+        keys = np.asarray(keys)
+        if self._hash is not None:
+            return self._hash.get_indexer(keys).astype(np.int32)
+        offset = keys.astype(np.int64) - self._low
+        inside = (offset >= 0) & (offset < len(self._slots))
+        positions = np.full(len(keys), -1, dtype=np.int32)
+        positions[inside] = self._slots[offset[inside]]
+        return positions
+
+
+# Region each agent writes the most sales premium in
+def agent_regions(sales):
+    agents, regions = sales["Agent"].cat, sales["Region"].cat
+    valid = (agents.codes >= 0) & (regions.codes >= 0)
+    cells = agents.codes[valid].astype(np.int64) * len(regions.categories) + regions.codes[valid]
+    premium = np.bincount(cells, weights=sales["Premium"].to_numpy()[valid],
+                          minlength=len(agents.categories) * len(regions.categories))
+    premium = premium.reshape(len(agents.categories), len(regions.categories))
+    home = pd.Categorical.from_codes(premium.argmax(axis=1), categories=regions.categories)
+    return pd.Series(home, index=agents.categories, name="Region").rename_axis("Agent")
+
+
+# Region codes (and labels) of rows through their Agent column
+def region_codes(agents, regions):
+    region = regions.reindex(agents.cat.categories).cat
+    codes = agents.cat.codes.to_numpy()
+    return np.where(codes >= 0, region.codes.to_numpy()[codes], -1), region.categories
+
+
+class Relations:
+    def __init__(self, policies, sales, regions=None):
+        self.policies = policies
+        self.policy_index = KeyIndex(policies["Policy ID"].to_numpy())
+        self.regions = agent_regions(sales) if regions is None else regions
+        self.sales = sales
+        self.version = None  # claims stream version folded in so far
+        self.unmatched_claims = 0
+        self._archived = None  # totals of claims that are not in the stream
+        size = len(policies)
+        self.claims = np.zeros(size, dtype=np.int64)
+        self.claimed = np.zeros(size, dtype=np.float64)
+        self.paid = np.zeros(size, dtype=np.float64)
+        self._breakdowns = {}  # dimension -> loss_ratio() frame, until claims change
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        return self.policy_index.nbytes + self.claims.nbytes + self.claimed.nbytes + self.paid.nbytes
+
+    # Join a batch of claims to policies and add it to the per-policy totals
+    def add_claims(self, claims):
+        position = self.policy_index.positions(claims["Policy ID"].to_numpy())
+        matched = position >= 0
+        position = position[matched]
+        amount = claims["Amount"].to_numpy(dtype=np.float64)[matched]
+        paid = claims["Status"].isin(PAID_CLAIM_STATUSES).to_numpy()[matched]
+        size = len(self.claims)
+        self.claims += np.bincount(position, minlength=size)
+        self.claimed += np.bincount(position, weights=amount, minlength=size)
+        self.paid += np.bincount(position[paid], weights=amount[paid], minlength=size)
+        self.unmatched_claims += int(len(matched) - matched.sum())
+        self._breakdowns = {}
+
+    # Add claims kept out of the stream (an out-of-core archive), a chunk at
+    # a time; sync() starts from these totals rather than zero
+    def add_archive(self, chunks):
+        for chunk in chunks:
+            self.add_claims(chunk)
+        self._archived = (self.claims.copy(), self.claimed.copy(), self.paid.copy(), self.unmatched_claims)
+
+    # Catch up with the claims stream: only the batches ingested since the
+    # last sync are joined, unless they have dropped out of its history
+    def sync(self, stream):
+        with self._lock:
+            if self.version == stream.version:
+                return self
+            version, new = stream.changes(self.version) if self.version is not None else (None, None)
+            if new is None:
+                claims, claimed, paid, unmatched = self._archived or (0, 0, 0, 0)
+                self.claims[:] = claims
+                self.claimed[:] = claimed
+                self.paid[:] = paid
+                self.unmatched_claims = unmatched
+                version, new = stream.snapshot()
+            self.add_claims(new)
+            self.version = version
+        return self
+
+    # Category codes of every policy (or sale) for a dimension, with their
+    # labels
+    def _codes(self, table, by):
+        if by == "Region":
+            return region_codes(table["Agent"], self.regions)
+        if by not in DIMENSIONS:
+            raise KeyError(f"Unknown dimension: {by!r}")
+        return table[by].cat.codes.to_numpy(), table[by].cat.categories
+
+    # Policies, premium, claims, claimed and paid amounts and loss ratio
+    # (paid / premium) by Product, Agent or Region, plus the sales premium
+    # written in the same category
+    def loss_ratio(self, by):
+        if by not in self._breakdowns:
+            self._breakdowns[by] = self._loss_ratio(by)
+        return self._breakdowns[by]
+
+    def _loss_ratio(self, by):
+        codes, labels = self._codes(self.policies, by)
+        valid = codes >= 0
+        codes = codes[valid]
+
+        def total(weights=None):
+            if weights is not None:
+                weights = weights[valid]
+            return np.bincount(codes, weights=weights, minlength=len(labels))
+
+        premium = total(self.policies["Premium"].to_numpy(dtype=np.float64))
+        paid = total(self.paid)
+        sale_codes, sale_labels = self._codes(self.sales, by)
+        sold = sale_codes >= 0
+        sales = pd.Series(
+            np.bincount(sale_codes[sold], weights=self.sales["Premium"].to_numpy(dtype=np.float64)[sold],
+                        minlength=len(sale_labels)),
+            index=sale_labels,
+        ).reindex(labels, fill_value=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(premium > 0, paid / premium, np.nan)
+        return pd.DataFrame({
+            by: labels,
+            "Policies": total().astype(np.int64),
+            "Premium": premium,
+            "Claims": total(self.claims).astype(np.int64),
+            "Claimed": total(self.claimed),
+            "Paid": paid,
+            "Loss Ratio": ratio,
+            "Sales Premium": sales.to_numpy(dtype=np.float64),
+        })
+
+    # Premium against claims and paid amounts for each policy (and so each
+    # customer, the policy holder)
+    def policy_summary(self):
+        return self.policies.assign(Claims=self.claims.copy(), Claimed=self.claimed.copy(), Paid=self.paid.copy())
+
+
+# Shared relations for the current source, kept in step with the claims
+# stream. Pinned because ingested claims are folded into it in place.
+def get_relations(stream, source=None):
+    source = source or get_source()
+
+    def build():
+        policies = get_dataset("policies", columns=POLICY_COLUMNS, source=source)
+        sales = get_dataset("sales", columns=["Product", "Agent", "Region", "Premium"], source=source)
+        relations = Relations(policies, sales)
+        if source.out_of_core:
+            from chunked import iter_chunks
+
+            relations.add_archive(iter_chunks(source, "claims", ["Policy ID", "Amount", "Status"]))
+        return relations
+
+    relations = cached(("relations", source.key()), build, deps=["claims", "policies", "sales"], pinned=True)
+    return relations.sync(stream)
@@ -0,0 +1,186 @@
+# schema.py
+# Typed storage schema for the dashboard tables.
+# Whatever a source hands back (generated frames, Parquet/Arrow extracts with
+# string IDs and dates), compact() converts it to one compact layout:
+# low-cardinality fields as categoricals, dates as datetime64, IDs as integer
+# keys with the prefix dropped, money and scores as float32 and percentages
+# as int8. display() turns the IDs back into "CLM20001"-style strings for the
+# handful of rows a page actually shows.
+#
+#   python schema.py --rows 1000000   # memory per row before and after
+import argparse
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from generators import DEFAULT_SEED, format_ids, generate_book
+
+ID = "id"
+CATEGORY = "category"
+DATE = "date"
+MONEY = "money"
+SCORE = "score"
+PERCENT = "percent"
+FLAG = "flag"
+TEXT = "text"
+
+# Display prefix of every ID column, shared by the tables that reference it
+ID_PREFIXES = {
+    "Policy ID": "POL",
+    "Claim ID": "CLM",
+    "Case ID": "UW",
+    "Opportunity ID": "OPP",
+    "Sale ID": "SAL",
+    "Application ID": "EAPP",
+}
+
+SCHEMAS = {
+    "policies": {
+        "Policy ID": ID, "Product": CATEGORY, "Holder": TEXT, "Start Date": DATE, "End Date": DATE,
+        "Premium": MONEY, "Status": CATEGORY, "Agent": CATEGORY,
+    },
+    "claims": {
+        "Claim ID": ID, "Policy ID": ID, "Type": CATEGORY, "Date Filed": DATE, "Amount": MONEY,
+        "Status": CATEGORY, "Customer": TEXT, "AI Flag": CATEGORY,
+    },
+    "underwriting": {
+        "Case ID": ID, "Applicant": TEXT, "Product": CATEGORY, "Risk Assessment": CATEGORY,
+        "AI Recommendation": CATEGORY, "Status": CATEGORY, "Date": DATE,
+    },
+    "marketing": {
+        "Opportunity ID": ID, "Customer": TEXT, "Product Interest": CATEGORY, "Channel": CATEGORY,
+        "Stage": CATEGORY, "Potential Premium": MONEY, "AI Score": SCORE,
+    },
+    "sales": {
+        "Sale ID": ID, "Date": DATE, "Product": CATEGORY, "Agent": CATEGORY, "Region": CATEGORY,
+        "Premium": MONEY, "Commission": MONEY,
+    },
+    "eapps": {
+        "Application ID": ID, "Customer": TEXT, "Product": CATEGORY, "Start Time": DATE,
+        "Last Activity": DATE, "Status": CATEGORY, "AI Assistance Used": FLAG, "Completion %": PERCENT,
+    },
+}
+
+
+def _int_keys(values):
+    if values.dtype == np.int32:
+        return values  # already compact; keep shared/mapped buffers as they are
+    keys = np.asarray(values, dtype=np.int64)
+    if len(keys) and keys.max() < 2**31 and keys.min() >= -2**31:
+        return keys.astype(np.int32)
+    return keys
+
+
+# "CLM20001" -> 20001 for a whole column, via Arrow string kernels
+def parse_ids(column, values):
+    if pd.api.types.is_integer_dtype(values):
+        return _int_keys(values)
+    digits = pc.utf8_slice_codeunits(pa.array(values, type=pa.large_string()), len(ID_PREFIXES[column]))
+    return _int_keys(pc.cast(digits, pa.int64()).to_numpy())
+
+
+# One typed-in ID to its key, or None if it is not a valid ID for the column
+def parse_id(column, text):
+    prefix = ID_PREFIXES[column]
+    text = str(text).strip().upper()
+    if text.startswith(prefix):
+        text = text[len(prefix):]
+    return int(text) if text.isdigit() else None
+
+
+def format_id(column, key):
+    return f"{ID_PREFIXES[column]}{int(key)}"
+
+
+def _compact_column(kind, column, values):
+    if kind == ID:
+        return parse_ids(column, values)
+    if kind == CATEGORY:
+        return values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype("category")
+    if kind == DATE:
+        return values if pd.api.types.is_datetime64_any_dtype(values) else pd.to_datetime(values)
+    if kind in (MONEY, SCORE):
+        return values.astype(np.float32)
+    if kind == PERCENT:
+        return values.astype(np.int8)
+    if kind == FLAG:
+        return values.astype(bool)
+    return values if values.dtype == "string" else values.astype("string[pyarrow]")
+
+
+# Convert the columns of `df` that the table's schema knows to their
+# compact types; already-compact columns are left as they are
+def compact(table, df):
+    schema = SCHEMAS[table]
+    converted = {
+        c: _compact_column(schema[c], c, df[c]) for c in df.columns if c in schema
+    }
+    return df.assign(**converted) if converted else df
+
+
+# Copy of a (small) frame with the ID columns formatted for display
+def display(df):
+    columns = {
+        c: format_ids(prefix, df[c].to_numpy()).array
+        for c, prefix in ID_PREFIXES.items()
+        if c in df.columns and pd.api.types.is_integer_dtype(df[c])
+    }
+    return df.assign(**columns) if columns else df
+
+
+# The row-per-object layout the dashboard used to keep: object strings for
+# IDs and categories, dates as strings, float64 money
+def legacy(table, df):
+    columns = {}
+    for column, kind in SCHEMAS[table].items():
+        values = df[column]
+        if kind == DATE:
+            fmt = "%Y-%m-%d %H:%M" if values.dt.second.any() or values.dt.minute.any() else "%Y-%m-%d"
+            columns[column] = values.dt.strftime(fmt).astype(object)
+        elif kind in (MONEY, SCORE):
+            columns[column] = values.astype(np.float64)
+        elif kind == PERCENT:
+            columns[column] = values.astype(np.int64)
+        elif kind != FLAG:
+            columns[column] = values.astype(str).astype(object)
+    return df.assign(**columns)
+
+
+def _bytes(df):
+    return int(df.memory_usage(deep=True, index=False).sum())
+
+
+# Bytes per row of each table in the legacy layout, as generated and once
+# compacted
+def memory_report(sizes=None, seed=DEFAULT_SEED):
+    book = generate_book(sizes, seed)
+    report = []
+    for table, generated in book.items():
+        rows = max(len(generated), 1)
+        before = _bytes(legacy(table, generated))
+        after = _bytes(compact(table, generated))
+        report.append({
+            "table": table,
+            "rows": len(generated),
+            "legacy_bytes_per_row": round(before / rows, 1),
+            "generated_bytes_per_row": round(_bytes(generated) / rows, 1),
+            "compact_bytes_per_row": round(after / rows, 1),
+            "reduction": f"{1 - after / before:.0%}" if before else "",
+        })
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report per-table memory before and after compaction.")
+    parser.add_argument("--rows", type=int, default=100_000, help="rows to generate per table")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args(argv)
+
+    sizes = {table: args.rows for table in SCHEMAS}
+    print(pd.DataFrame(memory_report(sizes, args.seed)).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+# shared_data.py
+# Multi-process server mode with one shared, read-only copy of the data.
+# publish() loads every dataset once, converts it to the compact schema and
+# writes it, with the precomputed KPI cubes, as single-batch Arrow IPC files
+# in shared memory (/dev/shm). Dashboard workers started by serve() read the
+# files through ArrowSource, which memory-maps them, so any number of worker
+# processes (and every session inside them) share one physical copy of the
+# tables instead of each process holding its own.
+#
+#   python shared_data.py publish --rows 1000000
+#   python shared_data.py serve --workers 4 --port 8501
+#   python shared_data.py benchmark --sessions 50 200 500 --workers 4
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+
+from backends import AGGREGATES_DIR, FORMATS, TABLES, SyntheticSource, default_source, export_synthetic, write_ipc
+from generators import DEFAULT_SIZES
+from kpis import CUBES, aggregate, cube_columns
+from schema import compact
+
+SHARED_DIR = os.environ.get("INSUREAI_SHARED_DIR", "/dev/shm/insureai")
+MANIFEST = "manifest.json"
+DASHBOARD = os.path.join(os.path.dirname(os.path.abspath(__file__)), "insurance_ai_dashboard.py")
+BENCHMARK_PAGES = ["Dashboard Overview", "Claims Automation", "Underwriting AI"]
+
+
+# Write every table and KPI cube of `source` to `root`; returns the manifest
+def publish(root=SHARED_DIR, source=None):
+    source = source or default_source()
+    manifest = {"source": repr(source.key()), "published_at": time.time(), "tables": {}}
+    for table in TABLES:
+        df = compact(table, source.load(table))
+        write_ipc(df, os.path.join(root, table + FORMATS["arrow"]))
+        manifest["tables"][table] = len(df)
+        if table in CUBES:
+            cube = aggregate(table, df[cube_columns(table)])
+            write_ipc(cube.reset_index(), os.path.join(root, AGGREGATES_DIR, f"kpi_{table}" + FORMATS["arrow"]))
+    with open(os.path.join(root, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+# Table sizes for a book with `rows` claims, other tables scaled to match
+def book_sizes(rows):
+    return {t: max(1, rows * n // DEFAULT_SIZES["claims"]) for t, n in DEFAULT_SIZES.items()}
+
+
+def _worker_env(root, format="arrow"):
+    return {**os.environ, "INSUREAI_DATA_DIR": root, "INSUREAI_DATA_FORMAT": format}
+
+
+# Run `workers` dashboard processes on consecutive ports over the published
+# data. Put a load balancer with sticky sessions in front of them.
+def serve(root=SHARED_DIR, workers=4, port=8501, streamlit_args=()):
+    if not os.path.exists(os.path.join(root, MANIFEST)):
+        raise FileNotFoundError(f"No published data in {root}; run 'python shared_data.py publish' first")
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", DASHBOARD,
+             "--server.port", str(port + i), "--server.headless", "true", *streamlit_args],
+            env=_worker_env(root),
+        )
+        for i in range(workers)
+    ]
+    print(f"Serving {workers} workers on ports {port}-{port + workers - 1} from {root}")
+    try:
+        for process in processes:
+            process.wait()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+
+
+# Proportional set size of this process: pages shared with other processes
+# (such as the mapped tables) are split between them, so summing PSS over
+# the workers gives the real memory cost
+def _memory():
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# One benchmark worker: open `sessions` dashboard sessions, kept alive side
+# by side, and render `pages` in each
+def _run_sessions(env, sessions, pages, results):
+    os.environ.update(env)
+    from streamlit.testing.v1 import AppTest
+
+    latencies, errors, apps = [], 0, []
+    for _ in range(sessions):
+        app = AppTest.from_file(DASHBOARD, default_timeout=300)
+        for i, page in enumerate(pages):
+            start = time.perf_counter()
+            if i == 0:
+                app.run()
+            if page != app.sidebar.radio[0].value:
+                app.sidebar.radio[0].set_value(page).run()
+            latencies.append(time.perf_counter() - start)
+            errors += len(app.exception)
+        apps.append(app)
+    results.put((latencies, errors, _memory()))
+
+
+def _measure(env, sessions, workers, pages):
+    context = get_context("spawn")
+    results = context.Queue()
+    shares = [sessions // workers + (i < sessions % workers) for i in range(workers)]
+    processes = [
+        context.Process(target=_run_sessions, args=(env, n, pages, results)) for n in shares if n
+    ]
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    latencies = np.concatenate([o[0] for o in outcomes]) * 1000
+    return {
+        "memory_mb": round(sum(o[2] for o in outcomes) / 2**20, 1),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 1),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 1),
+        "errors": sum(o[1] for o in outcomes),
+    }
+
+
+# Memory and page latency with every worker loading its own copy of the
+# data ("private", decoded from Parquet) against the shared mapped copy
+def benchmark(sessions=(50, 200, 500), workers=4, rows=100_000, pages=BENCHMARK_PAGES):
+    sizes = book_sizes(rows)
+    shm = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    private_root = tempfile.mkdtemp(prefix="insureai-private-")
+    shared_root = tempfile.mkdtemp(prefix="insureai-shared-", dir=shm)
+    report = []
+    try:
+        export_synthetic(private_root, "parquet", sizes)
+        publish(shared_root, SyntheticSource(sizes))
+        modes = {"private": _worker_env(private_root, "parquet"), "shared": _worker_env(shared_root)}
+        for count in sessions:
+            for mode, env in modes.items():
+                result = _measure(env, count, workers, pages)
+                report.append({"mode": mode, "sessions": count, "workers": workers, "claims": rows, **result})
+                print(report[-1], flush=True)
+    finally:
+        shutil.rmtree(private_root, ignore_errors=True)
+        shutil.rmtree(shared_root, ignore_errors=True)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publish shared data and run multi-process dashboard workers.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    publish_cmd = commands.add_parser("publish", help="write the datasets and KPI cubes to shared memory")
+    publish_cmd.add_argument("--root", default=SHARED_DIR)
+    publish_cmd.add_argument("--rows", type=int, help="publish a synthetic book with this many claims")
+
+    serve_cmd = commands.add_parser("serve", help="run dashboard workers over the published data")
+    serve_cmd.add_argument("--root", default=SHARED_DIR)
+    serve_cmd.add_argument("--workers", type=int, default=os.cpu_count())
+    serve_cmd.add_argument("--port", type=int, default=8501)
+
+    bench_cmd = commands.add_parser("benchmark", help="compare private and shared data at several session counts")
+    bench_cmd.add_argument("--sessions", type=int, nargs="+", default=[50, 200, 500])
+    bench_cmd.add_argument("--workers", type=int, default=4)
+    bench_cmd.add_argument("--rows", type=int, default=100_000, help="claims in the synthetic book")
+    bench_cmd.add_argument("--pages", nargs="+", default=BENCHMARK_PAGES)
+    bench_cmd.add_argument("--output", help="also write the report as JSON to this file")
+
+    args = parser.parse_args(argv)
+    if args.command == "publish":
+        source = SyntheticSource(book_sizes(args.rows)) if args.rows else None
+        print(json.dumps(publish(args.root, source), indent=2))
+    elif args.command == "serve":
+        serve(args.root, args.workers, args.port)
+    else:
+        report = benchmark(args.sessions, args.workers, args.rows, args.pages)
+        print(pd.DataFrame(report).to_string(index=False))
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+# similarity.py
+# Similar historical underwriting cases.
+# Every decided case (approved or declined) becomes a small feature vector:
+# product and AI recommendation one-hot, the ordinal risk assessment and the
+# vectorized AI risk score. CaseIndex is an inverted-file (IVF) index over
+# those vectors: k-means centroids partition the cases into lists, and a
+# search ranks the centroids, scans only the lists of the nearest few and
+# computes exact distances within them, so a top-k query touches a few
+# thousand rows whatever the size of the history. Tables small enough to
+# scan get a single list (an exact search).
+# Indexes are built on a background thread; pages keep using the previous
+# index until the rebuilt one is ready.
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import numpy as np
+import pandas as pd
+
+from datasets import shared
+from inference import CASE_RISK, score_cases
+from instrumentation import section
+
+DECISIONS = ["Approved", "Declined"]
+PRODUCT_WEIGHT = 1.0
+RISK_WEIGHT = 2.0
+SCORE_WEIGHT = 2.0
+RECOMMENDATION_WEIGHT = 0.5
+
+MIN_IVF_ROWS = 50_000  # below this a single list is scanned exactly
+MAX_LISTS = 4096
+PROBES = 8
+KMEANS_SAMPLE = 100_000
+KMEANS_ITERATIONS = 10
+ASSIGN_ROWS = 16384  # rows per chunk when assigning cases to lists
+
+
+def _one_hot(values, categories):
+    codes = pd.Categorical(values, categories=categories).codes
+    out = np.zeros((len(codes), len(categories)), dtype=np.float32)
+    known = codes >= 0
+    out[np.flatnonzero(known), codes[known]] = 1
+    return out
+
+
+def _ordinal(values, mapping, default=0.5):
+    codes = pd.Categorical(values, categories=list(mapping)).codes
+    return np.append(np.array(list(mapping.values()), dtype=np.float32), default)[codes]
+
+
+def _categories(values):
+    return list(values.cat.categories) if isinstance(values.dtype, pd.CategoricalDtype) else sorted(values.unique())
+
+
+# Feature matrix (float32, one row per case)
+def vectorize(cases, products, recommendations):
+    return np.hstack([
+        PRODUCT_WEIGHT * _one_hot(cases["Product"], products),
+        RISK_WEIGHT * _ordinal(cases["Risk Assessment"], CASE_RISK)[:, None],
+        SCORE_WEIGHT * score_cases(cases)["AI Risk Score"].to_numpy(np.float32)[:, None],
+        RECOMMENDATION_WEIGHT * _one_hot(cases["AI Recommendation"], recommendations),
+    ]).astype(np.float32)
+
+
+# Nearest centroid of each row, a chunk of rows at a time
+def _assign(features, centroids):
+    norms = (centroids ** 2).sum(axis=1)
+    out = np.empty(len(features), dtype=np.int32)
+    for start in range(0, len(features), ASSIGN_ROWS):
+        chunk = features[start:start + ASSIGN_ROWS]
+        out[start:start + len(chunk)] = np.argmin(norms - 2 * chunk @ centroids.T, axis=1)
+    return out
+
+
+# Lloyd's k-means on a sample of the rows; empty clusters keep their centroid
+def _kmeans(features, lists, seed=0):
+    rng = np.random.default_rng(seed)
+    sample = features[rng.choice(len(features), min(len(features), KMEANS_SAMPLE), replace=False)]
+    centroids = sample[rng.choice(len(sample), lists, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        labels = _assign(sample, centroids)
+        counts = np.bincount(labels, minlength=lists)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+    return centroids
+
+
+class CaseIndex:
+    # cases: decided underwriting cases; lists=None sizes the index from
+    # the number of cases
+    def __init__(self, cases, lists=None, seed=0):
+        self.products = _categories(cases["Product"])
+        self.recommendations = _categories(cases["AI Recommendation"])
+        features = vectorize(cases, self.products, self.recommendations)
+        if lists is None:
+            lists = 1 if len(cases) < MIN_IVF_ROWS else min(int(np.sqrt(len(cases))), MAX_LISTS)
+        lists = max(min(lists, len(cases)), 1)
+        if lists == 1:
+            self.centroids = features.mean(axis=0, keepdims=True) if len(cases) else features[:1]
+            labels = np.zeros(len(cases), dtype=np.int32)
+        else:
+            self.centroids = _kmeans(features, lists, seed)
+            labels = _assign(features, self.centroids)
+
+        # Cases stored list by list; offsets[i]:offsets[i + 1] is list i
+        order = np.argsort(labels, kind="stable")
+        self.cases = cases.iloc[order]
+        self.features = features[order]
+        self.offsets = np.searchsorted(labels[order], np.arange(len(self.centroids) + 1))
+
+    @property
+    def nbytes(self):
+        return self.features.nbytes + self.centroids.nbytes + self.offsets.nbytes
+
+    def __len__(self):
+        return len(self.features)
+
+    # Stored positions and distances of the k nearest cases to one feature
+    # vector; lists are probed nearest first until k candidates are found
+    def search(self, query, k=5, probes=PROBES):
+        ranked = np.argsort(((self.centroids - query) ** 2).sum(axis=1))
+        sizes = np.diff(self.offsets)[ranked]
+        probes = max(probes, int(np.searchsorted(np.cumsum(sizes), k)) + 1)
+        candidates = np.concatenate(
+            [np.arange(self.offsets[i], self.offsets[i + 1]) for i in ranked[:probes]] or [np.empty(0, np.int64)]
+        )
+        distances = ((self.features[candidates] - query) ** 2).sum(axis=1)
+        if len(candidates) > k:
+            nearest = np.argpartition(distances, k - 1)[:k]
+            candidates, distances = candidates[nearest], distances[nearest]
+        order = np.lexsort((candidates, distances))
+        return candidates[order], distances[order]
+
+    # The k historical cases most similar to `case` (a row or one-row
+    # frame), excluding the case itself, with a Similarity column in [0, 1]
+    def similar(self, case, k=5, probes=PROBES):
+        frame = (case.to_frame().T if isinstance(case, pd.Series) else case).infer_objects()
+        query = vectorize(frame, self.products, self.recommendations)[0]
+        positions, distances = self.search(query, k + 1, probes)
+        result = self.cases.iloc[positions].assign(Similarity=1 / (1 + np.sqrt(distances)))
+        return result[result["Case ID"] != frame["Case ID"].iloc[0]].head(k)
+
+
+def historical_cases(underwriting):
+    return underwriting[underwriting["Status"].isin(DECISIONS)]
+
+
+def _failed(future):
+    return future.done() and future.exception() is not None
+
+
+class SimilarityService:
+    # Builds CaseIndex objects on one background thread. current(df) returns
+    # the index for the underwriting frame `df`, or the last one built while
+    # a rebuild for a newer frame is running (None before the first build).
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="similarity")
+        self._lock = threading.Lock()
+        self._built = None  # (frame, CaseIndex)
+        self._pending = None  # (frame, Future)
+
+    def _build(self, df):
+        with section(f"build case index x{len(df)}", "aggregate"):
+            index = CaseIndex(historical_cases(df))
+        with self._lock:
+            self._built = (df, index)
+        return index
+
+    def current(self, df, wait=0.0):
+        with self._lock:
+            if self._built is not None and self._built[0] is df:
+                return self._built[1]
+            if self._pending is None or self._pending[0] is not df or _failed(self._pending[1]):
+                self._pending = (df, self._executor.submit(self._build, df))
+            future = self._pending[1]
+            stale = self._built[1] if self._built is not None else None
+        try:
+            return future.result(wait) if wait else stale
+        except TimeoutError:
+            return stale
+
+
+# The process-wide similar-case index, built once in the background and
+# rebuilt when the underwriting table changes
+def get_similarity_service():
+    return shared("similarity", SimilarityService)
@@ -0,0 +1,158 @@
+# tables.py
+# Server-side paginated tables for the large queues.
+# Instead of handing st.dataframe the whole table, pages render through
+# paged_table(): sorting uses a cached argsort index per column, filters use
+# cached per-value masks, and only the visible page is sliced out and
+# serialized to the browser. When claims are ingested the index is
+# extended rather than rebuilt: new rows are merged into the cached sort
+# orders and appended to the cached masks.
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import streamlit as st
+
+from datasets import derived
+from schema import display
+
+PAGE_SIZES = [25, 50, 100, 250]
+MAX_VIEWS = 8
+
+
+def _sort_order(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return np.argsort(series.cat.codes.to_numpy(), kind="stable")
+    if pd.api.types.is_datetime64_any_dtype(series) or pd.api.types.is_numeric_dtype(series):
+        return np.argsort(series.to_numpy(), kind="stable")
+    return pc.array_sort_indices(pa.array(series), null_placement="at_end").to_numpy()
+
+
+# Values a column is sorted on by _sort_order, for columns whose order can be
+# merged with new rows (None for strings)
+def _sort_keys(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy()
+    if pd.api.types.is_datetime64_any_dtype(series) or pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy()
+    return None
+
+
+# Merge rows start: of `series` into `order`, the ascending order of the rows
+# before them. New rows go after equal old ones, as in a stable sort.
+def _merged_order(order, series, start):
+    keys = _sort_keys(series)
+    if keys is None or pd.isna(keys[start:]).any():
+        return None
+    new = keys[start:]
+    new_order = np.argsort(new, kind="stable")
+    at = np.searchsorted(keys[:start][order], new[new_order], side="right")
+    return np.insert(order, at, new_order + start)
+
+
+class TableIndex:
+    # Sorted positions and filter masks for one table, built on first use
+    def __init__(self, df):
+        self.df = df
+        self._orders = {}  # column -> ascending row positions
+        self._masks = {}  # (column, values) -> boolean mask
+        self._views = OrderedDict()  # (sort, ascending, filters) -> row positions
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        arrays = list(self._orders.values()) + list(self._masks.values()) + list(self._views.values())
+        return sum(a.nbytes for a in arrays) + int(self.df.memory_usage(deep=True).sum())
+
+    def order(self, column, ascending=True):
+        with self._lock:
+            if column not in self._orders:
+                self._orders[column] = _sort_order(self.df[column])
+        order = self._orders[column]
+        return order if ascending else order[::-1]
+
+    def mask(self, column, values):
+        key = (column, tuple(sorted(values)))
+        with self._lock:
+            if key not in self._masks:
+                self._masks[key] = self.df[column].isin(values).to_numpy()
+            return self._masks[key]
+
+    # Row positions in display order for a sort and {column: values} filters
+    def positions(self, sort_by, ascending=True, filters=None):
+        filters = {c: v for c, v in (filters or {}).items() if v}
+        key = (sort_by, ascending, tuple(sorted((c, tuple(sorted(v))) for c, v in filters.items())))
+        with self._lock:
+            if key in self._views:
+                self._views.move_to_end(key)
+                return self._views[key]
+        order = self.order(sort_by, ascending)
+        if filters:
+            keep = np.logical_and.reduce([self.mask(c, v) for c, v in filters.items()])
+            order = order[keep[order]]
+        with self._lock:
+            self._views[key] = order
+            while len(self._views) > MAX_VIEWS:
+                self._views.popitem(last=False)
+        return order
+
+    # Index over `df`, the rows of this one's frame followed by rows start:
+    def extended(self, df, start):
+        index = TableIndex(df)
+        with self._lock:
+            orders, masks = dict(self._orders), dict(self._masks)
+        for column, order in orders.items():
+            if df[column].dtype == self.df[column].dtype:
+                merged = _merged_order(order, df[column], start)
+                if merged is not None:
+                    index._orders[column] = merged
+        new = df.iloc[start:]
+        for (column, values), mask in masks.items():
+            index._masks[(column, values)] = np.concatenate([mask, new[column].isin(values).to_numpy()])
+        return index
+
+    def page(self, sort_by, ascending=True, filters=None, page=0, page_size=25):
+        positions = self.positions(sort_by, ascending, filters)
+        start = page * page_size
+        return self.df.iloc[positions[start:start + page_size]], len(positions)
+
+    def top(self, sort_by, n, ascending=False):
+        return self.df.iloc[self.order(sort_by, ascending)[:n]]
+
+
+# Shared index for a dataset; see datasets.derived() for `version`
+def get_table_index(name, df, version=0):
+    return derived("table-index", name, df, version, lambda: TableIndex(df),
+                   lambda index, start: index.extended(df, start))
+
+
+# Render one page of a table with sort, filter and paging controls
+def paged_table(index, key, sort_columns, default_sort=None, descending=True, filter_columns=()):
+    df = index.df
+    default_sort = default_sort or sort_columns[0]
+    col1, col2, col3 = st.columns([3, 2, 2])
+    sort_by = col1.selectbox("Sort by", sort_columns, index=sort_columns.index(default_sort), key=f"{key}_sort")
+    order = col2.radio("Order", ["Descending", "Ascending"], index=0 if descending else 1,
+                       horizontal=True, key=f"{key}_order")
+    page_size = col3.selectbox("Rows per page", PAGE_SIZES, key=f"{key}_page_size")
+
+    filters = {}
+    if filter_columns:
+        filter_cols = st.columns(len(filter_columns))
+        for col, column in zip(filter_cols, filter_columns):
+            options = list(df[column].cat.categories) if isinstance(df[column].dtype, pd.CategoricalDtype) \
+                else sorted(df[column].dropna().unique())
+            filters[column] = col.multiselect(column, options, key=f"{key}_filter_{column}")
+
+    total = len(index.positions(sort_by, order == "Ascending", filters))
+    pages = max(1, -(-total // page_size))
+    # Clamp rather than bound the widget, so a narrower filter never errors
+    page = min(st.number_input("Page", min_value=1, value=1, key=f"{key}_page"), pages) - 1
+    rows, total = index.page(sort_by, order == "Ascending", filters, page, page_size)
+
+    st.dataframe(display(rows), use_container_width=True, hide_index=True)
+    start = page * page_size
+    st.caption(f"Rows {start + 1 if total else 0:,}–{start + len(rows):,} of {total:,} (page {page + 1:,} of {pages:,})")
+    return rows
@@ -0,0 +1,22 @@
+# tests/conftest.py
+# Shared fixtures: a small synthetic book as the current source, with the
+# dataset cache cleared before and after each test.
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import datasets  # noqa: E402
+from backends import SyntheticSource  # noqa: E402
+
+SIZES = {"policies": 400, "claims": 3000, "sales": 1000}
+
+
+@pytest.fixture
+def source():
+    source = SyntheticSource(SIZES)
+    datasets.set_source(source)
+    yield source
+    datasets.set_source(None)
@@ -0,0 +1,132 @@
+# tests/test_incremental.py
+# Indexes, reports and filtered frames extended from ingested claims must
+# match the ones built from scratch over the same table, and the entries
+# for older stream versions must be released.
+import numpy as np
+import pandas as pd
+import pytest
+
+import datasets
+import filters
+from entity_index import EntityIndex, get_entity_index
+from fraud_rules import evaluate, get_fraud_report
+from ingestion import get_claims_stream, simulate_batch
+from tables import TableIndex, get_table_index
+from timeseries import daily_rollup, get_daily
+
+SORT_COLUMNS = ["Date Filed", "Amount", "Claim ID", "Status", "Type", "AI Flag"]
+STATUS_FILTER = ("Status", ("Approved", "Paid"))
+BATCHES = [1, 250, 40]
+
+
+def _touch(df, version):
+    index = get_table_index("claims", df, version)
+    for column in SORT_COLUMNS:
+        index.order(column)
+    index.mask(*STATUS_FILTER)
+    get_entity_index("claims", df, version)
+    get_daily("claims", df, version, by="AI Flag")
+    return index
+
+
+def _assert_table_index(index, df):
+    rebuilt = TableIndex(df)
+    assert sorted(index._orders) == sorted(SORT_COLUMNS)
+    for column in SORT_COLUMNS:
+        np.testing.assert_array_equal(index.order(column), rebuilt.order(column))
+    np.testing.assert_array_equal(index.mask(*STATUS_FILTER), rebuilt.mask(*STATUS_FILTER))
+
+
+def _assert_entity_index(index, df):
+    rebuilt = EntityIndex(df, "Claim ID")
+    np.testing.assert_array_equal(index._sorted, rebuilt._sorted)
+    for key in df["Claim ID"].iloc[::97]:
+        assert index.position(key) == rebuilt.position(key)
+    for text in ["CLM", "CLM2", "1"]:
+        assert index.search(text) == rebuilt.search(text)
+
+
+def _assert_daily(daily, df):
+    pd.testing.assert_frame_equal(daily, daily_rollup(df, "Date Filed", ["Amount"], "AI Flag"),
+                                  check_dtype=False, check_freq=False)
+
+
+def _count_extends(monkeypatch):
+    calls = []
+    for cls in (TableIndex, EntityIndex):
+        extended = cls.extended
+        monkeypatch.setattr(cls, "extended", lambda self, *args, _f=extended: calls.append(1) or _f(self, *args))
+    return calls
+
+
+def test_extended_indexes_match_rebuild(source, monkeypatch):
+    calls = _count_extends(monkeypatch)
+    stream = get_claims_stream()
+    _touch(stream.frame(), stream.version)
+    for seed, rows in enumerate(BATCHES):
+        stream.append(simulate_batch(stream, rows, seed=seed))
+        df = stream.frame()
+        _assert_table_index(_touch(df, stream.version), df)
+        _assert_entity_index(get_entity_index("claims", df, stream.version), df)
+        _assert_daily(get_daily("claims", df, stream.version, by="AI Flag"), df)
+    assert len(calls) == 2 * len(BATCHES)
+
+
+def test_extended_fraud_report_matches_rebuild(source):
+    stream = get_claims_stream()
+    get_fraud_report(stream)
+    policies = datasets.get_dataset("policies", columns=["Policy ID", "Start Date", "End Date"])
+    for seed, rows in enumerate(BATCHES):
+        stream.append(simulate_batch(stream, rows, seed=seed))
+        report = get_fraud_report(stream)
+        rebuilt = evaluate(stream.frame(), policies)
+        pd.testing.assert_frame_equal(report.flags, rebuilt.flags)
+        pd.testing.assert_frame_equal(report.details, rebuilt.details, check_dtype=False)
+        pd.testing.assert_series_equal(report.score, rebuilt.score)
+
+
+def test_entity_index_keeps_first_row_of_duplicate_ids():
+    df = pd.DataFrame({"Claim ID": np.array([5, 3, 5, 9], dtype=np.int32)})
+    grown = pd.DataFrame({"Claim ID": np.array([5, 3, 5, 9, 3, 11, 11, 2], dtype=np.int32)})
+    index = EntityIndex(df, "Claim ID").extended(grown, len(df))
+    assert [index.position(f"CLM{key}") for key in [5, 3, 9, 11, 2]] == [0, 1, 3, 5, 7]
+    assert index.position("CLM4") is None and index.position("not an id") is None
+
+
+@pytest.mark.parametrize("state", [
+    (("Status", ("Approved", "Paid")),),
+    (("Product", ("Auto", "Home")),),
+])
+def test_extended_filtered_frames_match_rebuild(source, monkeypatch, state):
+    monkeypatch.setattr(filters, "current", lambda: state)
+    stream = get_claims_stream()
+    _touch(filters.filtered("claims", stream.frame(), stream.version), filters.view_version(stream.version))
+    for seed, rows in enumerate(BATCHES):
+        stream.append(simulate_batch(stream, rows, seed=seed))
+        full = stream.frame()
+        df = filters.filtered("claims", full, stream.version)
+        keep = filters._filter_index("claims", full, source).mask(state)
+        pd.testing.assert_frame_equal(df, full[keep])
+        assert 0 < len(df) < len(full)
+        version = filters.view_version(stream.version)
+        _assert_table_index(_touch(df, version), df)
+        _assert_entity_index(get_entity_index("claims", df, version), df)
+        _assert_daily(get_daily("claims", df, version, by="AI Flag"), df)
+
+
+def _entries(kind):
+    return [key for key, _ in datasets._cache.find(lambda key: key[0] == kind)]
+
+
+def test_superseded_versions_are_released(source):
+    stream = get_claims_stream()
+    for seed in range(3):
+        df = stream.frame()
+        _touch(df, stream.version)
+        get_fraud_report(stream)
+        stream.append(simulate_batch(stream, 10, seed=seed))
+    df = stream.frame()
+    _touch(df, stream.version)
+    get_fraud_report(stream)
+    for kind in ["table-index", "entity-index", "daily", "fraud"]:
+        assert [key[-2:] for key in _entries(kind)] == [(stream.version, len(df))], kind
@@ -0,0 +1,163 @@
+# timeseries.py
+# Trend series for the dashboard charts.
+# Tables are rolled up once per day with np.bincount (counts and amount
+# sums, optionally split by a categorical column); weekly and monthly views
+# are resampled from the daily rollup. Before plotting, long series are
+# reduced with Largest-Triangle-Three-Buckets (LTTB), which keeps the shape
+# of the line, so Plotly never receives more than MAX_POINTS per series.
+import numpy as np
+import pandas as pd
+
+from datasets import cached, derived, get_dataset, get_source
+
+FREQUENCIES = {"Daily": "D", "Weekly": "W-MON", "Monthly": "MS"}
+MAX_POINTS = 2000
+
+# Date column and summed measures rolled up for each table
+SERIES = {
+    "claims": {"date": "Date Filed", "sums": ["Amount"]},
+    "sales": {"date": "Date", "sums": ["Premium", "Commission"]},
+    "policies": {"date": "Start Date", "sums": ["Premium"]},
+}
+
+
+# Per-day row count and sums of `sums` (plus per-category counts of `by`),
+# one row for every day between the first and last date
+def daily_rollup(df, date, sums=(), by=None):
+    days = df[date].to_numpy(dtype="datetime64[D]").astype(np.int64)
+    if not len(days):
+        split = list(df[by].astype("category").cat.categories) if by is not None else []
+        return pd.DataFrame(0, columns=["count", *sums, *split], index=pd.DatetimeIndex([], name="Date"))
+    first = days.min()
+    slot = days - first
+    n = int(slot.max()) + 1
+
+    columns = {"count": np.bincount(slot, minlength=n)}
+    for column in sums:
+        columns[column] = np.bincount(slot, weights=df[column].to_numpy(np.float64), minlength=n)
+    if by is not None:
+        values = df[by].astype("category")
+        codes = values.cat.codes.to_numpy().astype(np.int64)
+        known = codes >= 0
+        split = np.bincount(codes[known] * n + slot[known], minlength=n * len(values.cat.categories))
+        for i, category in enumerate(values.cat.categories):
+            columns[category] = split[i * n:(i + 1) * n]
+
+    index = pd.DatetimeIndex((first + np.arange(n)).astype("datetime64[D]"), name="Date")
+    return pd.DataFrame(columns, index=index)
+
+
+# Rollups of different chunks of a table merge by adding them day by day
+def merge_daily(daily, partial):
+    merged = daily.add(partial, fill_value=0)
+    if len(merged):
+        merged = merged.asfreq("D", fill_value=0)
+    return merged.rename_axis("Date")
+
+
+def rollup(daily, frequency="Daily"):
+    rule = FREQUENCIES[frequency]
+    return daily if rule == "D" else daily.resample(rule, label="left", closed="left").sum()
+
+
+# Indices of the points LTTB keeps when reducing (x, y) to `max_points`.
+# The first and last points are always kept; each bucket in between keeps
+# the point forming the largest triangle with the previous pick and the
+# average of the next bucket.
+def lttb(x, y, max_points=MAX_POINTS):
+    n = len(x)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    keep = np.empty(max_points, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    previous = 0
+    for i in range(max_points - 2):
+        start, stop = edges[i], edges[i + 1]
+        following = slice(stop, edges[i + 2] if i + 2 < len(edges) else n)
+        avg_x, avg_y = x[following].mean(), y[following].mean()
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        keep[i + 1] = previous
+    return keep
+
+
+# Long-format (Date, Series, Value) frame of `columns` for px.line, each
+# series downsampled on its own
+def trend_lines(frame, columns, max_points=MAX_POINTS):
+    x = frame.index.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    parts = []
+    for column in columns:
+        values = frame[column].to_numpy(np.float64)
+        keep = lttb(x, np.nan_to_num(values), max_points)
+        parts.append(pd.DataFrame({
+            "Date": frame.index[keep],
+            "Series": column,
+            "Value": values[keep],
+        }))
+    return pd.concat(parts, ignore_index=True)
+
+
+# Shared daily rollup of a dataset (see datasets.derived() for `version`);
+# ingested rows are rolled up on their own and merged in
+def get_daily(table, df, version=0, by=None):
+    spec = SERIES[table]
+
+    def rolled_up(rows):
+        return daily_rollup(rows, spec["date"], spec["sums"], by)
+
+    return derived("daily", table, df, version, lambda: rolled_up(df),
+                   lambda daily, start: merge_daily(daily, rolled_up(df.iloc[start:])), params=(by,))
+
+
+# Daily rollup of the claims stream: the claims table's (get_table_daily())
+# plus the rows ingested since, rolled up on their own
+def get_stream_daily(stream, by=None):
+    spec = SERIES["claims"]
+    version, rows = stream.appended()
+    daily = get_table_daily("claims", by)
+    if not len(rows):
+        return daily
+
+    def rolled_up(start):
+        return daily_rollup(rows.iloc[start:], spec["date"], spec["sums"], by)
+
+    return derived("stream-daily", "claims", rows, version, lambda: merge_daily(daily, rolled_up(0)),
+                   lambda previous, start: merge_daily(previous, rolled_up(start)), params=(by,))
+
+
+def published_name(table, by=None):
+    return f"daily_{table}" + (f"_by_{by.lower().replace(' ', '_')}" if by else "")
+
+
+# Daily rollup of a whole dataset: the one published with the data (see
+# chunked.py) when the source has it, otherwise rolled up from the table
+def get_table_daily(table, by=None, source=None):
+    source = source or get_source()
+    spec = SERIES[table]
+
+    def build():
+        published = source.load_aggregate(published_name(table, by))
+        if published is not None:
+            return published.set_index("Date")
+        columns = [spec["date"], *spec["sums"]] + ([by] if by else [])
+        return daily_rollup(get_dataset(table, columns=columns, source=source), spec["date"], spec["sums"], by)
+
+    return cached(("table-daily", source.key(), table, by), build, deps=[table])
+
+
+# Claims volume and average severity per period
+def claims_trend(daily, frequency="Weekly"):
+    frame = rollup(daily[["count", "Amount"]], frequency)
+    severity = frame["Amount"] / frame["count"].where(frame["count"] > 0)
+    return pd.DataFrame({"Claims": frame["count"], "Severity": severity})
+
+
+# Premium and commission written per period
+def sales_trend(daily, frequency="Weekly"):
+    return rollup(daily[["Premium", "Commission"]], frequency)
@@ -0,0 +1,24 @@
+# views/__init__.py
+# One module per dashboard page. A page's module, and everything it
+# imports, is loaded the first time the page is opened, so a cold start
+# only pays for the sidebar and the page being shown.
+import importlib
+
+PAGES = {
+    "Dashboard Overview": "overview",
+    "Claims Automation": "claims_automation",
+    "Claims Summarization": "claims_summarization",
+    "Underwriting AI": "underwriting",
+    "Marketing & Sales": "marketing_sales",
+    "eApplications": "eapplications",
+}
+
+# Only listed in the sidebar while instrumentation is on
+HIDDEN_PAGES = {
+    "Diagnostics": "diagnostics",
+}
+
+
+def render(page):
+    module = PAGES.get(page) or HIDDEN_PAGES[page]
+    importlib.import_module(f"views.{module}").render()
@@ -0,0 +1,94 @@
+# views/__main__.py
+# Import-time profile of the dashboard, one fresh interpreter per page.
+# Reports what the sidebar costs on its own, what each page module adds on
+# its first visit and the heaviest packages behind it; --render also times
+# a cold first render of each page.
+#
+#   python -m views
+#   python -m views --render --top 5
+import argparse
+import os
+import subprocess
+import sys
+
+import views
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD = os.path.join(ROOT, "insurance_ai_dashboard.py")
+
+_IMPORT = """
+import time
+start = time.perf_counter()
+import streamlit, views
+sidebar = time.perf_counter()
+{page_import}
+print(sidebar - start, time.perf_counter() - sidebar)
+"""
+
+_RENDER = """
+import time
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({dashboard!r}, default_timeout=300)
+start = time.perf_counter()
+app.run()
+if {page!r} != app.sidebar.radio[0].value:
+    app.sidebar.radio[0].set_value({page!r}).run()
+print(time.perf_counter() - start, len(app.exception))
+"""
+
+
+def _python(code, importtime=False):
+    args = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    return subprocess.run(args, cwd=ROOT, capture_output=True, text=True, check=True)
+
+
+# Cumulative import time per top-level package from -X importtime output
+def _packages(stderr):
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.strip()
+        if cumulative.strip().isdigit() and "." not in name:
+            times[name] = max(times.get(name, 0), int(cumulative) / 1e6)
+    return times
+
+
+def profile(pages=tuple(views.PAGES), top=8, render=False):
+    baseline = _packages(_python(_IMPORT.format(page_import=""), importtime=True).stderr)
+    rows = []
+    for page in pages:
+        code = _IMPORT.format(page_import=f"import views.{views.PAGES[page]}")
+        sidebar, page_import = map(float, _python(code).stdout.split())
+        heaviest = _packages(_python(code, importtime=True).stderr)
+        added = sorted(((t, n) for n, t in heaviest.items() if n not in baseline), reverse=True)[:top]
+        row = {
+            "page": page,
+            "sidebar_s": round(sidebar, 3),
+            "page_import_s": round(page_import, 3),
+            "heaviest": ", ".join(f"{n} {t:.2f}s" for t, n in added),
+        }
+        if render:
+            seconds, errors = _python(_RENDER.format(dashboard=DASHBOARD, page=page)).stdout.split()[-2:]
+            row["first_render_s"] = round(float(seconds), 3)
+            row["errors"] = int(errors)
+        rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile dashboard import and first-render times per page.")
+    parser.add_argument("--pages", nargs="+", choices=list(views.PAGES), default=list(views.PAGES))
+    parser.add_argument("--top", type=int, default=8, help="heaviest packages to list per page")
+    parser.add_argument("--render", action="store_true", help="also time a cold first render of each page")
+    args = parser.parse_args(argv)
+
+    for row in profile(args.pages, args.top, args.render):
+        print(f"{row['page']}: sidebar {row['sidebar_s']:.3f}s, page imports {row['page_import_s']:.3f}s"
+              + (f", first render {row['first_render_s']:.3f}s ({row['errors']} errors)" if args.render else ""))
+        print(f"    {row['heaviest']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# views/claims_automation.py
+# Claims Automation page: claims queue, fraud detection and automation stats.
+import pandas as pd
+import streamlit as st
+
+from entity_index import entity_picker, get_entity_index
+from exports import export_panel
+from filters import current, filtered, mask, view_version
+from fraud_rules import RULES, get_fraud_report, reasons
+from inference import CLAIM_ASSESSMENT
+from ingestion import get_claims_stream, simulate_batch
+from instrumentation import section
+from schema import display, format_id
+from tables import get_table_index, paged_table
+from timeseries import get_daily, get_stream_daily, rollup, trend_lines
+from views.common import show_ai_result
+
+
+def render():
+    st.title("Claims Automation Center")
+    st.write("AI-powered claims processing and fraud detection")
+    claims_stream = get_claims_stream()
+    
+    tab1, tab2, tab3 = st.tabs(["Claims Queue", "Fraud Detection", "Automation Stats"])
+    
+    with tab1, section("claims queue tab", "render"):
+        st.subheader("Claims Processing Queue")
+        if st.button("Ingest new claims"):
+            claims_stream.append(simulate_batch(claims_stream))
+
+        # Show what arrived since this session last looked at the queue
+        seen_version = st.session_state.get("claims_version", claims_stream.version)
+        new_claims = claims_stream.since(seen_version)
+        st.session_state["claims_version"] = claims_stream.version
+        if new_claims is not None and not new_claims.empty:
+            st.info(f"{len(new_claims)} new claims since last refresh")
+            st.dataframe(display(new_claims), use_container_width=True, hide_index=True)
+
+        claims_df = filtered("claims", claims_stream.frame(), claims_stream.version)
+        paged_table(get_table_index("claims", claims_df, view_version(claims_stream.version)), "claims_queue",
+                    ["Date Filed", "Amount", "Claim ID", "Status", "Type", "AI Flag"],
+                    filter_columns=["Status", "Type", "AI Flag"])
+        export_panel(claims_df, "claims_queue", "claims_export")
+        
+        claims_index = get_entity_index("claims", claims_df, view_version(claims_stream.version))
+        selected_claim = entity_picker(claims_index, "Select a claim to process", "process_claim")
+        if st.button("Process with AI", disabled=selected_claim is None):
+            st.session_state["processing_claim"] = selected_claim
+
+        def render_assessment(result):
+            st.success("Processing complete!")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.subheader("AI Recommendations")
+                st.write(f"Claim ID: {selected_claim}")
+                st.write(f"**Assessment:** {result['assessment']}")
+                st.write(f"**Recommended Action:** {result['recommended_action']}")
+                st.write(f"**Confidence Score:** {result['confidence']}%")
+            
+            with col2:
+                st.subheader("Next Steps")
+                st.write("1. Verify supporting documents")
+                st.write("2. Confirm policy coverage")
+                st.write("3. Process payment if approved")
+                
+                if st.button("Approve Claim", type="primary"):
+                    st.success("Claim approved successfully!")
+
+        if selected_claim is not None and st.session_state.get("processing_claim") == selected_claim:
+            claim = claims_index.get(selected_claim)
+            show_ai_result(CLAIM_ASSESSMENT, selected_claim, render_assessment,
+                           "AI is processing the claim...", payload=claim.to_dict())
+    
+    with tab2, section("fraud detection tab", "render"):
+        st.subheader("Potential Fraud Indicators")
+        fraud_report = get_fraud_report(claims_stream)
+        # The stream is append-only, so a frame read after the report covers every row it scored
+        claims_df = claims_stream.frame()
+        flags, scores = fraud_report.flags, fraud_report.score
+        in_view = mask("claims", claims_df, claims_stream.version)
+        if in_view is not None:
+            flags, scores = flags[in_view[:len(scores)]], scores[in_view[:len(scores)]]
+        
+        rule_cols = st.columns(len(RULES))
+        for col, rule in zip(rule_cols, RULES):
+            col.metric(rule.name.replace("_", " ").title(), f"{int(flags[rule.name].sum()):,}",
+                       help=f"{rule.label} ({fraud_report.timings[rule.name] * 1000:.1f} ms)")
+        st.caption(f"Rules evaluated over {len(fraud_report.score):,} claims in "
+                   f"{sum(fraud_report.timings.values()) * 1000:.1f} ms")
+        
+        # Review the highest-scoring claims first
+        suspicious = scores[scores > 0].nlargest(10)
+        
+        if not suspicious.empty:
+            for index in suspicious.index:
+                claim = claims_df.loc[index]
+                claim_id = format_id("Claim ID", claim["Claim ID"])
+                with st.expander(f"Claim {claim_id} - {claim['Type']} (score {suspicious[index]:.1f})"):
+                    st.write(f"**Policy:** {format_id('Policy ID', claim['Policy ID'])}")
+                    st.write(f"**Amount:** ${claim['Amount']:,.2f}")
+                    st.write(f"**Risk Factors:**")
+                    for reason in reasons(fraud_report, index):
+                        st.write(f"- {reason}")
+                    
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        if st.button(f"Investigate {claim_id}"):
+                            st.warning(f"Claim {claim_id} flagged for investigation")
+                    with col2:
+                        if st.button(f"Clear {claim_id}"):
+                            st.success(f"Claim {claim_id} cleared for processing")
+        else:
+            st.success("No suspicious claims detected")
+    
+    with tab3, section("automation stats tab", "render"):
+        st.subheader("Automation Performance")
+        
+        # Low-risk claims go straight through AI processing; the rest are
+        # reviewed manually
+        if current():
+            claims_daily = get_daily("claims", filtered("claims", claims_stream.frame(), claims_stream.version),
+                                     view_version(claims_stream.version), by="AI Flag")
+        else:
+            claims_daily = get_stream_daily(claims_stream, by="AI Flag")
+        weekly = rollup(claims_daily, "Weekly")
+        impact = pd.DataFrame({
+            "Manual Processing": weekly["count"] - weekly["Low Risk"],
+            "AI Processing": weekly["Low Risk"],
+        })
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            # Compare the last two complete weeks
+            automated = impact["AI Processing"].iloc[-3:-1]
+            delta = f"{(automated.iloc[1] - automated.iloc[0]) / automated.iloc[0]:+.0%} vs prior week" \
+                if len(automated) == 2 and automated.iloc[0] else None
+            st.metric("Claims Processed Automatically", f"{int(automated.iloc[-1]) if len(automated) else 0:,}", delta)
+        with col2:
+            st.metric("Average Processing Time", "2.1 hours", "45% reduction")
+        with col3:
+            st.metric("Fraud Detection Rate", "92%", "8% improvement")
+        
+        st.write("")
+        st.write("**Automation Impact**")
+        impact_lines = trend_lines(impact, list(impact.columns))
+        st.line_chart(impact_lines, x="Date", y="Value", color="Series")
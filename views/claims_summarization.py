@@ -0,0 +1,71 @@
+# views/claims_summarization.py
+# Claims Summarization page.
+import streamlit as st
+
+from entity_index import entity_picker, get_entity_index
+from exports import export_button, export_text
+from filters import filtered, view_version
+from inference import CLAIM_SUMMARY
+from ingestion import get_claims_stream
+from views.common import show_ai_result
+
+
+# Plain-text claim summary report
+def summary_report(claim_id, summary):
+    lines = [f"Claim Summary for {claim_id}", "", summary["description"], "", "Key Factors"]
+    lines += [f"- {factor}" for factor in summary["key_factors"]]
+    lines += [
+        "",
+        "AI Assessment",
+        f"Assessment: {summary['ai_assessment']}",
+        f"Confidence: {summary['confidence']}%",
+        f"Recommendation: {summary['recommended_action']}",
+    ]
+    for doc, key_points in summary["documents"].items():
+        lines += ["", doc] + [f"- {point}" for point in key_points]
+    return lines
+
+
+def render():
+    st.title("Claims Document Summarization")
+    st.write("AI-powered summarization of complex claim documents")
+    claims_stream = get_claims_stream()
+    claims_df = filtered("claims", claims_stream.frame(), claims_stream.version)
+    claims_index = get_entity_index("claims", claims_df, view_version(claims_stream.version))
+    
+    selected_claim = entity_picker(claims_index, "Select a claim to summarize", "summary_claim_id")
+    
+    if st.button("Generate Summary", disabled=selected_claim is None):
+        st.session_state["summary_claim"] = selected_claim
+
+    def render_summary(summary):
+        st.subheader(f"Claim Summary for {selected_claim}")
+        st.write(summary["description"])
+        
+        st.subheader("Key Factors")
+        for factor in summary["key_factors"]:
+            st.write(f"- {factor}")
+        
+        st.subheader("AI Assessment")
+        cols = st.columns(3)
+        cols[0].write(f"**Assessment:** {summary['ai_assessment']}")
+        cols[1].write(f"**Confidence:** {summary['confidence']}%")
+        cols[2].write(f"**Recommendation:** {summary['recommended_action']}")
+        
+        st.divider()
+        st.subheader("Supporting Documents")
+        
+        for doc, key_points in summary["documents"].items():
+            with st.expander(doc):
+                st.write(f"This is a simulated {doc.lower()} for claim {selected_claim}.")
+                st.write("**AI-extracted key points:**")
+                for point in key_points:
+                    st.write(f"- {point}")
+        
+        export_button("Export Full Summary", lambda: export_text(summary_report(selected_claim, summary),
+                                                                f"summary_{selected_claim}.txt"),
+                      f"summary_export_{selected_claim}")
+
+    if selected_claim is not None and st.session_state.get("summary_claim") == selected_claim:
+        show_ai_result(CLAIM_SUMMARY, selected_claim, render_summary,
+                       "AI is analyzing claim documents...")
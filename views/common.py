@@ -0,0 +1,28 @@
+# views/common.py
+# Helpers shared by the page modules.
+import streamlit as st
+
+from inference import get_inference_service
+
+
+# Helper function for metrics cards
+def create_metric_card(label, value, delta=None, help_text=None):
+    col = st.columns(1)[0]
+    col.metric(label=label, value=value, delta=delta, help=help_text)
+
+
+# Render an AI result once the inference service has it. Until then only a
+# small fragment polls for it, so the page stays usable while the model runs.
+def show_ai_result(kind, key, render, message, payload=None):
+    future = get_inference_service().submit(kind, key, payload)
+    if future.done():
+        render(future.result())
+        return
+
+    @st.fragment(run_every=0.5)
+    def wait_for_result():
+        if future.done():
+            st.rerun()
+        st.info(message)
+
+    wait_for_result()
@@ -0,0 +1,109 @@
+# views/diagnostics.py
+# Diagnostics page, listed only while instrumentation is on: per-rerun
+# timings and memory, the slowest sections across reruns, AI batches from
+# the inference threads and log export.
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import instrumentation
+from datasets import cache_stats
+
+
+# Time spent in each section itself, excluding the sections nested in it
+def _self_seconds(sections):
+    sections = sorted(sections, key=lambda s: s["offset"])
+    own = [s["seconds"] for s in sections]
+    stack = []
+    for i, s in enumerate(sections):
+        while stack and s["offset"] >= sections[stack[-1]]["offset"] + sections[stack[-1]]["seconds"]:
+            stack.pop()
+        if stack:
+            own[stack[-1]] -= s["seconds"]
+        stack.append(i)
+    return sections, own
+
+
+def render():
+    st.title("Diagnostics")
+    st.write("Timings and memory recorded by the instrumentation layer, one entry per rerun")
+
+    ctx = get_script_run_ctx()
+    only_mine = st.checkbox("This session only", value=True)
+    session = ctx.session_id if ctx and only_mine else None
+    runs = instrumentation.runs(session)
+
+    if not runs:
+        st.info("No reruns recorded yet; open a page and come back.")
+    else:
+        st.subheader("Reruns")
+        st.dataframe(pd.DataFrame([{
+            "Started": pd.Timestamp(r["started"], unit="s").strftime("%H:%M:%S"),
+            "Page": r["page"],
+            "Total (ms)": round(r["seconds"] * 1000, 1),
+            "Net memory (MB)": round(r["net_mb"], 2),
+            "Peak memory (MB)": None if r["peak_mb"] is None else round(r["peak_mb"], 2),
+            "Sections": len(r["sections"]),
+        } for r in reversed(runs)]), use_container_width=True, hide_index=True)
+
+        choice = st.selectbox(
+            "Inspect rerun", range(len(runs) - 1, -1, -1),
+            format_func=lambda i: f"{runs[i]['page']} at "
+                                  f"{pd.Timestamp(runs[i]['started'], unit='s'):%H:%M:%S} "
+                                  f"({runs[i]['seconds'] * 1000:.0f} ms)",
+        )
+        sections, own = _self_seconds(runs[choice]["sections"])
+        if sections:
+            breakdown = pd.DataFrame({
+                "Section": ["    " * s["depth"] + s["name"] for s in sections],
+                "Kind": [s["kind"] for s in sections],
+                "Total (ms)": [round(s["seconds"] * 1000, 2) for s in sections],
+                "Self (ms)": [round(t * 1000, 2) for t in own],
+                "Net memory (MB)": [round(s["net_mb"], 2) for s in sections],
+            })
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                st.dataframe(breakdown, use_container_width=True, hide_index=True)
+            with col2:
+                st.write("**Self time by kind (ms)**")
+                st.bar_chart(breakdown.groupby("Kind")["Self (ms)"].sum())
+
+        st.subheader("Slowest sections across reruns")
+        events = pd.DataFrame([s for r in runs for s in r["sections"] if s["kind"] != "page"])
+        if not events.empty:
+            slowest = events.groupby(["name", "kind"])["seconds"].agg(
+                ["count", "mean", lambda x: x.quantile(0.95), "max", "sum"]
+            )
+            slowest.columns = ["Calls", "Mean (ms)", "p95 (ms)", "Max (ms)", "Total (ms)"]
+            slowest.iloc[:, 1:] = (slowest.iloc[:, 1:] * 1000).round(1)
+            st.dataframe(slowest.sort_values("Total (ms)", ascending=False).head(20).reset_index(),
+                         use_container_width=True, hide_index=True)
+
+    st.subheader("AI batches and other background work")
+    background = instrumentation.background()
+    if background:
+        st.dataframe(pd.DataFrame([{
+            "At": pd.Timestamp(e["at"], unit="s").strftime("%H:%M:%S"),
+            "Section": e["name"],
+            "Thread": e["thread"],
+            "Duration (ms)": round(e["seconds"] * 1000, 1),
+        } for e in reversed(background)]), use_container_width=True, hide_index=True)
+    else:
+        st.caption("Nothing recorded yet.")
+
+    st.subheader("Dataset cache")
+    stats = cache_stats()
+    cols = st.columns(4)
+    cols[0].metric("Entries", f"{stats['entries']:,}")
+    cols[1].metric("Size", f"{stats['bytes'] / 2**20:,.1f} MB", help=f"Limit {stats['max_bytes'] / 2**20:,.0f} MB")
+    cols[2].metric("Hits", f"{stats['hits']:,}")
+    cols[3].metric("Misses", f"{stats['misses']:,}")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("Download logs (JSON lines)", instrumentation.export_logs(session=session),
+                           file_name="insureai_diagnostics.jsonl", mime="application/json")
+    with col2:
+        if st.button("Clear recorded runs"):
+            instrumentation.clear()
+            st.rerun()
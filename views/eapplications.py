@@ -0,0 +1,110 @@
+# views/eapplications.py
+# eApplications page: application queue, AI assistance and completion analytics.
+import pandas as pd
+import streamlit as st
+
+from datasets import get_dataset
+from entity_index import entity_picker, get_entity_index
+from exports import export_button, export_panel, export_text
+from filters import filtered, filtered_kpi_engine, view_version
+from inference import EAPP_ASSISTANCE
+from instrumentation import section
+from tables import get_table_index, paged_table
+from views.common import show_ai_result
+
+
+# Plain-text checklist of what an application still needs
+def application_checklist(app_id, application, assistance):
+    lines = [f"Application Checklist for {app_id}", ""]
+    if application is not None:
+        lines += [
+            f"Customer: {application['Customer']}",
+            f"Product: {application['Product']}",
+            f"Completion: {application['Completion %']}%",
+            "",
+        ]
+    lines += ["Fields to complete"] + [f"[ ] {field}" for field in assistance["suggested_fields"]]
+    lines += ["", "Tips"] + [f"- {tip}" for tip in assistance["completion_tips"]]
+    return lines
+
+
+def render():
+    st.title("AI-Powered eApplications")
+    st.write("Smart application assistance and completion analytics")
+    eapp_df = filtered("eapps", get_dataset("eapps"))
+    
+    tab1, tab2, tab3 = st.tabs(["Application Queue", "AI Assistance", "Completion Analytics"])
+    
+    with tab1, section("application queue tab", "render"):
+        st.subheader("Current Applications")
+        paged_table(get_table_index("eapps", eapp_df, view_version()), "application_queue",
+                    ["Last Activity", "Start Time", "Completion %", "Application ID"],
+                    filter_columns=["Status", "Product"])
+        export_panel(eapp_df, "applications", "applications_export")
+        
+        applications_index = get_entity_index("eapps", eapp_df, view_version())
+        selected_app = entity_picker(applications_index, "Select an application to review", "review_application")
+        application = applications_index.get(selected_app) if selected_app is not None else None
+        
+        if application is not None:
+            st.write(f"**Application:** {selected_app}")
+            st.write(f"**Customer:** {application['Customer']}")
+            st.write(f"**Product:** {application['Product']}")
+            st.write(f"**Status:** {application['Status']}")
+            st.write(f"**Completion:** {application['Completion %']}%")
+        
+            st.progress(application["Completion %"] / 100)
+    
+    with tab2, section("AI assistance tab", "render"):
+        st.subheader("AI Application Assistant")
+        
+        if st.button("Get AI Assistance", disabled=selected_app is None):
+            st.session_state["assisted_app"] = selected_app
+
+        def render_assistance(assistance):
+            st.success("AI suggestions ready!")
+            st.write("**Suggested Fields to Complete:**")
+            for field in assistance["suggested_fields"]:
+                st.write(f"- {field}")
+            
+            st.write("")
+            st.write("**Completion Tips:**")
+            for tip in assistance["completion_tips"]:
+                st.write(f"- {tip}")
+            
+            st.write("")
+            st.write(f"**Estimated Time Saved:** {assistance['estimated_time_saved']}")
+            
+            export_button("Export Application Checklist",
+                          lambda: export_text(application_checklist(selected_app, application, assistance),
+                                              f"checklist_{selected_app}.txt"),
+                          f"checklist_export_{selected_app}")
+
+        if selected_app is not None and st.session_state.get("assisted_app") == selected_app:
+            show_ai_result(EAPP_ASSISTANCE, selected_app, render_assistance,
+                           f"AI is analyzing application {selected_app}...")
+    
+    with tab3, section("completion analytics tab", "render"):
+        st.subheader("Application Analytics")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write("**Completion Rates by Product**")
+            completion_by_product = filtered_kpi_engine().average("eapps", "Product", "Completion %")
+            completion_by_product = completion_by_product.rename("Completion %").reset_index()
+            st.bar_chart(completion_by_product, x="Product", y="Completion %")
+        
+        with col2:
+            st.write("**AI Assistance Impact**")
+            ai_impact = pd.DataFrame({
+                "With AI": [65, 72, 80],
+                "Without AI": [45, 50, 55]
+            }, index=["Start Rate", "Completion Rate", "Approval Rate"])
+            st.bar_chart(ai_impact)
+        
+        st.write("")
+        st.subheader("Abandonment Analysis")
+        st.write("**Top Abandonment Points:**")
+        st.write("- Medical history section (32%)")
+        st.write("- Beneficiary details (28%)")
+        st.write("- Payment information (18%)")
@@ -0,0 +1,95 @@
+# views/marketing_sales.py
+# Marketing & Sales page: opportunities, sales performance and lead scoring.
+import streamlit as st
+
+from charts import figure, totals
+from datasets import get_dataset
+from entity_index import entity_picker, get_entity_index
+from filters import current, filtered, filtered_kpi_engine, view_version
+from instrumentation import section
+from schema import display
+from tables import get_table_index, paged_table
+
+
+def render():
+    st.title("Marketing & Sales Intelligence")
+    st.write("AI-powered lead scoring and sales optimization")
+    marketing_df = filtered("marketing", get_dataset("marketing"))
+    sales_df = filtered("sales", get_dataset("sales"))
+    kpi_engine = filtered_kpi_engine()
+    
+    tab1, tab2, tab3 = st.tabs(["Opportunities", "Sales Performance", "AI Lead Scoring"])
+    
+    with tab1, section("opportunities tab", "render"):
+        st.subheader("Marketing Opportunities")
+        paged_table(get_table_index("marketing", marketing_df, view_version()), "opportunities",
+                    ["AI Score", "Potential Premium", "Opportunity ID"],
+                    filter_columns=["Stage", "Channel", "Product Interest"])
+        
+        st.subheader("Opportunity Distribution")
+        import plotly.express as px
+
+        def opportunities_chart():
+            by_stage = totals(marketing_df, ["Stage", "Product Interest"], "Potential Premium")
+            return px.bar(by_stage, x="Stage", y="Potential Premium", color="Product Interest",
+                          title="Opportunities by Stage and Product")
+
+        fig = figure("opportunities by stage", opportunities_chart, state=current(), deps=["marketing"])
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with tab2, section("sales performance tab", "render"):
+        st.subheader("Sales Performance")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write("**Sales by Product**")
+            product_sales = kpi_engine.total("sales", "Product", "Premium").reset_index()
+            st.bar_chart(product_sales, x="Product", y="Premium")
+        
+        with col2:
+            st.write("**Sales by Agent**")
+            agent_sales = kpi_engine.total("sales", "Agent", "Premium").reset_index()
+            st.bar_chart(agent_sales, x="Agent", y="Premium")
+        
+        st.write("")
+        st.subheader("Recent Sales")
+        st.dataframe(display(get_table_index("sales", sales_df, view_version()).top("Date", 10)), use_container_width=True, hide_index=True)
+    
+    with tab3, section("lead scoring tab", "render"):
+        st.subheader("AI Lead Scoring")
+        
+        opportunity_index = get_entity_index("marketing", marketing_df, view_version())
+        selected_opp = entity_picker(opportunity_index, "Select opportunity for AI analysis", "lead_opportunity")
+        opportunity = opportunity_index.get(selected_opp) if selected_opp is not None else None
+        
+        if opportunity is not None:
+            st.write(f"**Opportunity:** {selected_opp}")
+            st.write(f"**Customer:** {opportunity['Customer']}")
+            st.write(f"**Product Interest:** {opportunity['Product Interest']}")
+        
+            st.write("")
+            st.subheader("AI Scoring Factors")
+        
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write("**Positive Factors**")
+                st.write("- Matches ideal customer profile")
+                st.write("- Previous engagement with marketing")
+                st.write("- High income bracket")
+        
+            with col2:
+                st.write("**Negative Factors**")
+                st.write("- No prior relationship")
+                st.write("- Competitive quotes obtained")
+                st.write("- Long sales cycle expected")
+        
+            st.write("")
+            st.metric("AI Conversion Probability", f"{opportunity['AI Score']*100:.0f}%")
+        
+            st.progress(float(opportunity["AI Score"]))
+        
+            st.write("")
+            st.subheader("Recommended Actions")
+            st.write("1. Personalize outreach with bundle options")
+            st.write("2. Offer free consultation")
+            st.write("3. Follow up within 3 days")
@@ -0,0 +1,135 @@
+# views/overview.py
+# Dashboard Overview page: KPI row, trend charts, loss ratio breakdown and
+# recent activity.
+import streamlit as st
+
+from charts import figure
+from datasets import get_dataset
+from filters import current, filtered, filtered_kpi_engine, filtered_relations, view_version
+from instrumentation import section
+from ingestion import get_claims_stream
+from kpis import CUBES
+from relations import DIMENSIONS
+from schema import display
+from tables import get_table_index
+from timeseries import FREQUENCIES, claims_trend, get_daily, get_stream_daily, get_table_daily, sales_trend, trend_lines
+from views.common import create_metric_card
+
+
+def render():
+    st.title("InsureAI - Insurance Platform Dashboard")
+    st.write("AI-powered solutions for modern insurance operations")
+
+    # Each page loads only the tables and columns it renders, as late as it can
+    kpi_engine = filtered_kpi_engine()
+    filter_state = current()
+    
+    # KPI Row
+    st.subheader("Key Performance Indicators")
+    with section("KPI row", "render"):
+        kpi_row = kpi_engine.overview()
+        for col, (label, value, delta) in zip(st.columns(len(kpi_row)), kpi_row):
+            with col:
+                create_metric_card(label, value, delta)
+    
+    # Charts Row. Plotly is imported only now, after the KPI row is on screen.
+    import plotly.express as px
+
+    claims_stream = get_claims_stream()
+    st.subheader("Performance Trends")
+    frequency = st.radio("Granularity", list(FREQUENCIES), index=1, horizontal=True, key="trend_frequency")
+    if filter_state:
+        claims_daily = get_daily("claims", filtered("claims", claims_stream.frame(), claims_stream.version),
+                                 view_version(claims_stream.version), by="AI Flag")
+        sales_daily = get_daily("sales", filtered("sales", get_dataset("sales")), view_version())
+    else:
+        claims_daily = get_stream_daily(claims_stream, by="AI Flag")
+        sales_daily = get_table_daily("sales")
+    trend_col1, trend_col2 = st.columns(2)
+    
+    def claims_chart():
+        claims_lines = trend_lines(claims_trend(claims_daily, frequency), ["Claims", "Severity"])
+        fig = px.line(claims_lines, x="Date", y="Value", facet_row="Series", title="Claims Volume and Severity")
+        fig.update_yaxes(matches=None, title_text="")
+        fig.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
+        return fig
+
+    def sales_chart():
+        sales_lines = trend_lines(sales_trend(sales_daily, frequency), ["Premium", "Commission"])
+        return px.line(sales_lines, x="Date", y="Value", color="Series", title="Premium and Commission Written")
+
+    with trend_col1, section("claims trend chart", "render"):
+        fig = figure("claims trend", claims_chart, claims_stream.version, (frequency, filter_state),
+                     deps=["claims", "policies", "sales"])
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with trend_col2, section("sales trend chart", "render"):
+        fig = figure("sales trend", sales_chart, state=(frequency, filter_state), deps=["sales"])
+        st.plotly_chart(fig, use_container_width=True)
+    
+    chart_col1, chart_col2 = st.columns(2)
+    
+    with chart_col1, section("premium by product chart", "render"):
+        # Sales by product
+        def premium_chart():
+            sales_by_product = kpi_engine.total("sales", "Product", "Premium").reset_index()
+            return px.bar(sales_by_product, x="Product", y="Premium", title="Premium by Product")
+
+        fig = figure("premium by product", premium_chart, kpi_engine.version, filter_state, deps=list(CUBES))
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with chart_col2, section("claims by status chart", "render"):
+        # Claims status
+        def status_chart():
+            claims_by_status = kpi_engine.total("claims", "Status").reset_index()
+            return px.pie(claims_by_status, values="count", names="Status", title="Claims by Status")
+
+        fig = figure("claims by status", status_chart, kpi_engine.version, filter_state, deps=list(CUBES))
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Loss ratio by policy dimension, from claims joined to their policies
+    st.subheader("Loss Ratio Breakdown")
+    by = st.radio("Break down by", DIMENSIONS, horizontal=True, key="loss_ratio_by")
+    with section("loss ratio breakdown", "render"):
+        relations = filtered_relations(claims_stream)
+        breakdown = relations.loss_ratio(by)
+        ratio_col1, ratio_col2 = st.columns([1, 2])
+        with ratio_col1:
+            def loss_ratio_chart():
+                fig = px.bar(breakdown, x=by, y="Loss Ratio", title=f"Loss Ratio by {by}")
+                fig.update_yaxes(tickformat=".0%")
+                return fig
+
+            fig = figure("loss ratio", loss_ratio_chart, relations.version, (by, filter_state),
+                         deps=["claims", "policies", "sales"])
+            st.plotly_chart(fig, use_container_width=True)
+        with ratio_col2:
+            st.dataframe(
+                breakdown, hide_index=True, use_container_width=True,
+                column_config={
+                    "Premium": st.column_config.NumberColumn(format="$%.0f"),
+                    "Claimed": st.column_config.NumberColumn(format="$%.0f"),
+                    "Paid": st.column_config.NumberColumn(format="$%.0f"),
+                    "Sales Premium": st.column_config.NumberColumn(format="$%.0f"),
+                    "Loss Ratio": st.column_config.NumberColumn(format="percent"),
+                },
+            )
+
+    # Recent activity
+    st.subheader("Recent Activity")
+    activity_col1, activity_col2 = st.columns(2)
+    
+    with activity_col1, section("recent claims", "render"):
+        st.write("**Recent Claims**")
+        if filter_state:
+            recent_claims = get_table_index("claims", filtered("claims", claims_stream.frame(), claims_stream.version),
+                                            view_version(claims_stream.version)).top("Date Filed", 5)
+        else:
+            recent_claims = claims_stream.latest(5)
+        st.dataframe(display(recent_claims), hide_index=True)
+    
+    with activity_col2, section("recent underwriting cases", "render"):
+        st.write("**Underwriting Cases**")
+        underwriting_df = filtered("underwriting", get_dataset("underwriting"))
+        st.dataframe(display(get_table_index("underwriting", underwriting_df, view_version()).top("Date", 5)),
+                     hide_index=True)
@@ -0,0 +1,89 @@
+# views/underwriting.py
+# Underwriting AI page: case queue and AI recommendations.
+import streamlit as st
+
+from datasets import get_dataset
+from entity_index import entity_picker, get_entity_index
+from exports import export_panel
+from filters import filtered, view_version
+from inference import UNDERWRITING
+from instrumentation import section
+from schema import format_id
+from similarity import get_similarity_service
+from tables import get_table_index, paged_table
+from views.common import show_ai_result
+
+
+def render():
+    st.title("AI Underwriting Assistant")
+    st.write("Risk assessment and decision support for underwriters")
+    # Similar cases come from the whole history, whatever the filters; the
+    # index builds in the background while the page renders
+    history_df = get_dataset("underwriting")
+    get_similarity_service().current(history_df)
+    underwriting_df = filtered("underwriting", history_df)
+    
+    tab1, tab2 = st.tabs(["Case Queue", "AI Recommendations"])
+    
+    with tab1, section("case queue tab", "render"):
+        st.subheader("Underwriting Cases")
+        paged_table(get_table_index("underwriting", underwriting_df, view_version()), "underwriting_cases",
+                    ["Date", "Case ID", "Risk Assessment", "Status"],
+                    filter_columns=["Status", "Risk Assessment", "Product"])
+        export_panel(underwriting_df, "underwriting_cases", "underwriting_export")
+    
+    with tab2, section("AI recommendations tab", "render"):
+        cases_index = get_entity_index("underwriting", underwriting_df, view_version())
+        selected_case = entity_picker(cases_index, "Select a case for AI analysis", "underwriting_case_id")
+        
+        if st.button("Generate AI Recommendation", disabled=selected_case is None):
+            st.session_state["underwriting_case"] = selected_case
+
+        def render_recommendation(recommendation):
+            st.subheader(f"AI Underwriting Recommendation for {selected_case}")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write("**Risk Factors**")
+                for factor in recommendation["risk_factors"]:
+                    st.write(f"- {factor}")
+                
+                st.write("")
+                st.write("**Supporting Data**")
+                st.write("- Credit score: Good")
+                st.write("- Loss history: Clean")
+            
+            with col2:
+                st.metric("AI Risk Score", recommendation["ai_score"])
+                st.write("**Recommendation:**")
+                st.success(recommendation["recommendation"])
+                
+                st.write("")
+                st.write("**Similar Historical Cases**")
+                case_index = get_similarity_service().current(history_df, wait=1.0)
+                similar = case_index.similar(case, k=3) if case_index is not None else None
+                if similar is None:
+                    st.caption("Indexing historical cases...")
+                elif similar.empty:
+                    st.caption("No decided cases to compare with yet")
+                else:
+                    for _, other in similar.iterrows():
+                        st.write(f"- Case #{format_id('Case ID', other['Case ID'])}: {other['Status']} "
+                                 f"({other['Product']}, {other['Risk Assessment']} risk, "
+                                 f"{other['Similarity']:.0%} similar)")
+            
+            st.divider()
+            st.subheader("Next Steps")
+            st.write("1. Review AI recommendation")
+            st.write("2. Verify applicant information")
+            st.write("3. Make final underwriting decision")
+            
+            decision = st.radio("Underwriting Decision", 
+                              ["Approve", "Approve with Conditions", "Decline", "Request More Info"])
+            if st.button("Submit Decision"):
+                st.success(f"Decision submitted: {decision} for case {selected_case}")
+
+        if selected_case is not None and st.session_state.get("underwriting_case") == selected_case:
+            case = cases_index.get(selected_case)
+            show_ai_result(UNDERWRITING, selected_case, render_recommendation,
+                           "AI is analyzing the underwriting case...", payload=case.to_dict())